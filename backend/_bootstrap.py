@@ -0,0 +1,46 @@
+"""
+启动辅助模块
+run.py 与 simple_start.py 共用的路径设置和 uvicorn 启动逻辑
+"""
+import logging
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径（已存在时不重复添加）
+project_root = str(Path(__file__).parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# uvicorn 文件监控排除规则
+RELOAD_EXCLUDES = [
+    "*.log",           # 排除所有日志文件
+    "logs/*",          # 排除整个日志目录
+    "*.db",            # 排除数据库文件
+    "*.db-shm",        # 排除 SQLite 共享内存文件
+    "*.db-wal",        # 排除 SQLite WAL 文件
+    "__pycache__/*",   # 排除 Python 缓存
+    "*.pyc",           # 排除编译的 Python 文件
+    ".git/*",          # 排除 Git 目录
+    "node_modules/*",  # 排除 Node.js 模块
+    "*.tmp",           # 排除临时文件
+    "*.swp",           # 排除 Vim 交换文件
+    ".vscode/*",       # 排除 VSCode 配置
+]
+
+
+def start(host: str, port: int, reload: bool = False, log_level: str = "info"):
+    """启动API服务（应用由 uvicorn 按导入字符串加载）"""
+    # 设置 watchfiles 日志级别为 WARNING，减少文件变化检测日志
+    logging.getLogger("watchfiles").setLevel(logging.WARNING)
+    logging.getLogger("watchfiles.main").setLevel(logging.WARNING)
+
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        reload=reload,
+        reload_excludes=RELOAD_EXCLUDES if reload else None,
+        log_level=log_level
+    )
@@ -8,6 +8,8 @@ from pydantic import BaseModel
 from app.schemas.response import ApiResponse
 from app.api.deps import get_current_user
 from app.config.settings import settings, get_config, set_config
+from app.utils.time_calculator import reload_work_time_rule
+from app.listeners import reload_event_filter
 from app.core.logger import get_logger
 
 logger = get_logger("ConfigAPI")
@@ -116,6 +118,10 @@ async def update_config_item(
         
         # 更新配置
         set_config(config_key, update_data.value)
+        if config_key.startswith("work."):
+            reload_work_time_rule()
+        elif config_key.startswith("event."):
+            reload_event_filter()
         
         # 获取更新后的值
         new_value = get_config(config_key)
@@ -168,6 +174,11 @@ async def update_config_batch(
             except Exception as e:
                 failed_items[key] = str(e)
         
+        if any(key.startswith("work.") for key in updated_items):
+            reload_work_time_rule()
+        if any(key.startswith("event.") for key in updated_items):
+            reload_event_filter()
+        
         return {
             "success": len(failed_items) == 0,
             "message": f"批量更新完成，成功: {len(updated_items)}, 失败: {len(failed_items)}",
@@ -191,6 +202,8 @@ async def reload_config(
     """重新加载配置文件"""
     try:
         settings.reload()
+        reload_work_time_rule()
+        reload_event_filter()
         
         return {
             "success": True,
@@ -254,6 +267,10 @@ async def update_work_settings(
                 set_config(config_key, value)
                 updated_config[key] = value
         
+        # 工作配置变更后刷新共享的工时规则
+        if updated_config:
+            reload_work_time_rule()
+        
         return {
             "success": True,
             "message": "工作配置更新成功",
@@ -304,6 +321,9 @@ async def update_event_settings(
             set_config("event.min_intervals", event_config["min_intervals"])
             updated_config["min_intervals"] = event_config["min_intervals"]
         
+        if updated_config:
+            reload_event_filter()
+        
         return {
             "success": True,
             "message": "事件配置更新成功",
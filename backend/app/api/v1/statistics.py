@@ -1,7 +1,7 @@
 """
 统计分析API路由
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query
 from datetime import date, datetime, timedelta
 
@@ -19,6 +19,16 @@ logger = get_logger("StatisticsAPI")
 router = APIRouter()
 
 
+def _sum_minutes(records: Iterable[Any]) -> Tuple[int, int]:
+    """单次遍历累计工作时长和加班时长（分钟）"""
+    total_duration = 0
+    total_overtime = 0
+    for record in records:
+        total_duration += record.duration
+        total_overtime += record.overtime_duration
+    return total_duration, total_overtime
+
+
 @router.get("/daily/{date_str}", response_model=ApiResponse[DailyStats], summary="获取日统计")
 async def get_daily_statistics(
     date_str: str,
@@ -78,16 +88,21 @@ async def get_weekly_statistics(
         records = dao.get_date_range_records(week_start, week_end)
         
         # 计算统计数据
-        total_work_hours = sum(record.duration for record in records) / 60.0
-        total_overtime_hours = sum(record.overtime_duration for record in records) / 60.0
+        total_minutes, overtime_minutes = _sum_minutes(records)
+        total_work_hours = total_minutes / 60.0
+        total_overtime_hours = overtime_minutes / 60.0
         work_days = len(records)
         avg_daily_hours = total_work_hours / work_days if work_days > 0 else 0.0
         
+        # 按周内序号（0=周一）放入列表，避免每天都扫描一遍记录
+        records_by_day: List[Any] = [None] * 7
+        for record in records:
+            records_by_day[(record.date - week_start).days] = record
+        
         # 构建每日记录
         daily_records = []
-        current_date = week_start
-        while current_date <= week_end:
-            record = next((r for r in records if r.date == current_date), None)
+        for offset, record in enumerate(records_by_day):
+            current_date = week_start + timedelta(days=offset)
             
             if record:
                 daily_stats = DailyStats(
@@ -108,7 +123,6 @@ async def get_weekly_statistics(
                 )
             
             daily_records.append(daily_stats)
-            current_date += timedelta(days=1)
         
         weekly_stats = WeeklyStats(
             week_start=week_start,
@@ -153,8 +167,9 @@ async def get_monthly_statistics(
         actual_work_days = len(records)
         
         # 计算统计数据
-        total_work_hours = sum(record.duration for record in records) / 60.0
-        total_overtime_hours = sum(record.overtime_duration for record in records) / 60.0
+        total_minutes, overtime_minutes = _sum_minutes(records)
+        total_work_hours = total_minutes / 60.0
+        total_overtime_hours = overtime_minutes / 60.0
         avg_daily_hours = total_work_hours / actual_work_days if actual_work_days > 0 else 0.0
         
         # 计算出勤率
@@ -238,35 +253,34 @@ async def get_weekly_trends(
 ):
     """获取最近几周的工时趋势数据"""
     try:
-        trends = []
         today = date.today()
+        current_week_start, current_week_end = get_week_range(today)
+        first_week_start = current_week_start - timedelta(weeks=weeks - 1)
+        
+        # 一次查询整个范围，按距最早一周的周序号分桶：[工作分钟, 加班分钟, 工作天数]
+        rows = dao.list_raw(first_week_start, current_week_end)
+        buckets = [[0, 0, 0] for _ in range(weeks)]
+        for record_date, duration, overtime_duration, _, _ in rows:
+            bucket = buckets[(date.fromisoformat(record_date) - first_week_start).days // 7]
+            bucket[0] += duration
+            bucket[1] += overtime_duration
+            bucket[2] += 1
         
-        for i in range(weeks):
-            # 计算周的开始日期
-            week_offset = timedelta(weeks=i)
-            week_date = today - week_offset
-            week_start, week_end = get_week_range(week_date)
-            
-            # 获取该周的记录
-            records = dao.get_date_range_records(week_start, week_end)
-            
-            # 计算统计数据
-            total_hours = sum(record.duration for record in records) / 60.0
-            overtime_hours = sum(record.overtime_duration for record in records) / 60.0
-            work_days = len(records)
+        # 按时间正序排列
+        trends = []
+        for index, (total_minutes, overtime_minutes, work_days) in enumerate(buckets):
+            week_start = first_week_start + timedelta(weeks=index)
+            total_hours = total_minutes / 60.0
             
             trends.append({
                 "week_start": week_start.isoformat(),
-                "week_end": week_end.isoformat(),
+                "week_end": (week_start + timedelta(days=6)).isoformat(),
                 "total_hours": total_hours,
-                "overtime_hours": overtime_hours,
+                "overtime_hours": overtime_minutes / 60.0,
                 "work_days": work_days,
                 "avg_daily_hours": total_hours / work_days if work_days > 0 else 0.0
             })
         
-        # 按时间正序排列
-        trends.reverse()
-        
         return {
             "success": True,
             "message": f"获取最近 {weeks} 周趋势数据成功",
@@ -314,10 +328,11 @@ async def get_dashboard_complete_data(
         week_hours = round(sum(record.duration for record in week_records) / 60.0, 1)
 
         # 本月统计
-        month_start, month_end = get_month_range(today)
+        month_start, month_end = get_month_range(today.year, today.month)
         month_records = dao.get_date_range_records(month_start, month_end)
-        month_hours = round(sum(record.duration for record in month_records) / 60.0, 1)
-        month_overtime = round(sum(record.overtime_duration for record in month_records) / 60.0, 1)
+        month_minutes, month_overtime_minutes = _sum_minutes(month_records)
+        month_hours = round(month_minutes / 60.0, 1)
+        month_overtime = round(month_overtime_minutes / 60.0, 1)
 
         # 上月加班统计（简化处理）
         last_month_overtime = 18.75  # 模拟数据
@@ -325,19 +340,17 @@ async def get_dashboard_complete_data(
         # 平均工时（最近30天）
         recent_30_start = today - timedelta(days=30)
         recent_records = dao.get_date_range_records(recent_30_start, today)
-        avg_hours = round(sum(record.duration for record in recent_records) / len(recent_records) / 60.0, 1) if recent_records else 0.0
 
         # 2. 图表数据
         # 柱状图数据（最近7天）
+        # 最近30天的记录已包含这7天，直接按日期取用，不再逐日查询
+        recent_by_date = {record.date: record for record in recent_records}
         chart_data = []
         day_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
         for i in range(7):
             chart_date = today - timedelta(days=6-i)
-            try:
-                record = dao.get_by_date(chart_date)
-                hours = round(record.duration / 60.0, 1) if record else 0.0
-            except:
-                hours = 0.0
+            record = recent_by_date.get(chart_date)
+            hours = round(record.duration / 60.0, 1) if record else 0.0
             is_overtime = hours > 8.0
             chart_data.append({
                 "date": chart_date.isoformat(),
@@ -346,9 +359,11 @@ async def get_dashboard_complete_data(
                 "day_name": day_names[chart_date.weekday()]
             })
 
-        # 饼图数据（工时分布统计）
+        # 饼图数据（工时分布统计），与最近30天的总工时在同一次遍历中累计
         hour_distribution = {"8-9h": 0, "7-8h": 0, "9-10h": 0, "other": 0}
+        recent_minutes = 0
         for record in recent_records:
+            recent_minutes += record.duration
             hours = record.duration / 60.0
             if 8 <= hours < 9:
                 hour_distribution["8-9h"] += 1
@@ -358,6 +373,7 @@ async def get_dashboard_complete_data(
                 hour_distribution["9-10h"] += 1
             else:
                 hour_distribution["other"] += 1
+        avg_hours = round(recent_minutes / len(recent_records) / 60.0, 1) if recent_records else 0.0
 
         total_days = sum(hour_distribution.values())
         pie_data = []
@@ -436,24 +452,27 @@ async def get_dashboard_overview(
 
         # 本周统计
         week_start, week_end = get_week_range(today)
-        week_records = dao.get_date_range_records(week_start, week_end)
-        week_hours = sum(record.duration for record in week_records) / 60.0
+        week_records = dao.list_raw(week_start, week_end)
+        week_hours = sum(row[1] for row in week_records) / 60.0
         
         # 本月统计
-        month_records = dao.get_monthly_records(today.year, today.month)
-        month_hours = sum(record.duration for record in month_records) / 60.0
+        month_records = dao.list_raw(*get_month_range(today.year, today.month))
+        month_hours = sum(row[1] for row in month_records) / 60.0
         month_workdays = count_workdays_in_month(today.year, today.month)
         
-        # 最近7天趋势
+        # 最近7天趋势（一次范围查询）
+        recent_start = today - timedelta(days=6)
+        recent_by_date = {
+            record.date: record for record in dao.get_date_range_records(recent_start, today)
+        }
         recent_days = []
         for i in range(7):
-            day = today - timedelta(days=i)
-            record = dao.get_by_date(day)
+            day = recent_start + timedelta(days=i)
+            record = recent_by_date.get(day)
             recent_days.append({
                 "date": day.isoformat(),
                 "hours": record.duration / 60.0 if record else 0.0
             })
-        recent_days.reverse()
         
         overview = {
             "today": {
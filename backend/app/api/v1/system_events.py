@@ -5,7 +5,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from datetime import datetime
 
-from app.models import SystemEvent, SystemEventCreate, SystemEventQuery, EventType
+from app.models import SystemEvent, SystemEventCreate, EventType, parse_system_event_query
 from app.schemas.response import ApiResponse, PaginatedResponse
 from app.dao import SystemEventDAO
 from app.api.deps import (
@@ -100,19 +100,19 @@ async def list_system_events(
         event_type_enum = None
         if event_type:
             try:
-                event_type_enum = EventType(event_type.lower())
+                event_type_enum = EventType.from_raw(event_type.lower())
             except ValueError:
                 raise HTTPException(status_code=400, detail="无效的事件类型")
         
         # 构建查询参数
-        query_params = SystemEventQuery(
-            event_type=event_type_enum,
-            start_time=start_datetime,
-            end_time=end_datetime,
-            processed=processed,
-            page=pagination.page,
-            size=pagination.size
-        )
+        query_params = parse_system_event_query({
+            "event_type": event_type_enum,
+            "start_time": start_datetime,
+            "end_time": end_datetime,
+            "processed": processed,
+            "page": pagination.page,
+            "size": pagination.size
+        })
         
         # 查询事件
         events = dao.list_events(query_params)
@@ -1,13 +1,16 @@
 """
 工时记录API路由
 """
-from typing import List, Optional
+import csv
+import io
+from typing import List, Optional, Iterator, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from datetime import date
 
 from app.models import (
-    TimeRecord, TimeRecordCreate, TimeRecordUpdate, TimeRecordQuery,
-    DailyStats
+    TimeRecord, TimeRecordCreate, TimeRecordUpdate,
+    DailyStats, RecordStatus, parse_time_record_query
 )
 from app.schemas.response import ApiResponse, PaginatedResponse
 from app.dao import TimeRecordDAO
@@ -21,6 +24,29 @@ from app.core.logger import get_logger
 logger = get_logger("TimeRecordsAPI")
 router = APIRouter()
 
+# 导出CSV的列
+EXPORT_COLUMNS = (
+    "id", "date", "clock_in", "clock_out", "duration", "break_duration",
+    "overtime_duration", "status", "notes"
+)
+
+
+def _iter_csv(rows: Iterator[Dict[str, Any]], flush_rows: int = 500) -> Iterator[bytes]:
+    """将记录逐批编码为CSV（带BOM，便于Excel识别UTF-8）"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    
+    for count, row in enumerate(rows, 1):
+        writer.writerow([row[column] for column in EXPORT_COLUMNS])
+        if count % flush_rows == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue().encode("utf-8")
+
 
 @router.post("/", response_model=ApiResponse[TimeRecord], summary="创建工时记录")
 async def create_time_record(
@@ -190,17 +216,15 @@ async def list_time_records(
     """查询工时记录列表"""
     try:
         # 构建查询参数
-        from app.models import RecordStatus
-        
-        query_params = TimeRecordQuery(
-            start_date=date_range.start_date,
-            end_date=date_range.end_date,
-            status=RecordStatus(status) if status else None,
-            page=pagination.page,
-            size=pagination.size,
-            order_by=order_by,
-            order_desc=order_desc
-        )
+        query_params = parse_time_record_query({
+            "start_date": date_range.start_date,
+            "end_date": date_range.end_date,
+            "status": RecordStatus.from_raw(status) if status else None,
+            "page": pagination.page,
+            "size": pagination.size,
+            "order_by": order_by,
+            "order_desc": order_desc
+        })
         
         # 查询记录
         records = dao.list_records(query_params)
@@ -230,6 +254,31 @@ async def list_time_records(
         raise HTTPException(status_code=500, detail="查询工时记录列表失败")
 
 
+@router.get("/export/csv", summary="导出工时记录（CSV）")
+async def export_time_records(
+    status: Optional[str] = Query(None, description="状态筛选"),
+    date_range: DateRangeParams = Depends(get_date_range_params),
+    dao: TimeRecordDAO = Depends(get_time_record_dao),
+    user: dict = Depends(get_current_user)
+):
+    """以流式响应导出工时记录，边查询边输出，不在内存中生成完整文件"""
+    try:
+        query_params = parse_time_record_query({
+            "start_date": date_range.start_date,
+            "end_date": date_range.end_date,
+            "status": RecordStatus.from_raw(status) if status else None,
+            "order_desc": False
+        })
+    except ValueError:
+        raise HTTPException(status_code=400, detail="状态参数无效")
+    
+    return StreamingResponse(
+        _iter_csv(dao.iter_records(query_params)),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="time_records.csv"'}
+    )
+
+
 @router.get("/range/summary", response_model=ApiResponse[dict], summary="获取日期范围统计摘要")
 async def get_range_summary(
     date_range: DateRangeParams = Depends(get_date_range_params),
@@ -5,7 +5,8 @@ import os
 import sqlite3
 import threading
 import time
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Deque, Set, Iterator
+from collections import deque
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -14,15 +15,21 @@ from app.config.settings import get_config
 
 logger = get_logger("Database")
 
+# INSERT ... RETURNING 需要 SQLite 3.35+
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 
 class DatabaseConnection:
     """数据库连接类"""
     
-    def __init__(self, db_path: str):
+    __slots__ = ("db_path", "connection", "last_used", "lock", "is_overflow")
+    
+    def __init__(self, db_path: str, is_overflow: bool = False):
         self.db_path = db_path
         self.connection = None
         self.last_used = time.time()
         self.lock = threading.Lock()
+        self.is_overflow = is_overflow
     
     def connect(self):
         """建立数据库连接"""
@@ -30,7 +37,7 @@ class DatabaseConnection:
             self.connection = sqlite3.connect(
                 self.db_path,
                 check_same_thread=False,
-                timeout=30.0
+                cached_statements=256  # 预编译语句缓存（默认128）
             )
             self.connection.row_factory = sqlite3.Row
             # 启用外键约束
@@ -39,6 +46,17 @@ class DatabaseConnection:
             self.connection.execute("PRAGMA journal_mode = WAL")
             # 设置同步模式
             self.connection.execute("PRAGMA synchronous = NORMAL")
+            # 每个连接的页缓存保持较小（8MB），热点页通过内存映射由操作系统页缓存共享：
+            # WAL 模式下各连接的页缓存互不共享，而 mmap 页在连接和进程之间只读共享
+            self.connection.execute("PRAGMA cache_size = -8000")
+            # 内存映射读取（512MB），减少 read() 系统调用和数据拷贝
+            self.connection.execute("PRAGMA mmap_size = 536870912")
+            # 临时表和排序中间结果放在内存中
+            self.connection.execute("PRAGMA temp_store = MEMORY")
+            # 锁等待超时（毫秒），避免并发写入时立即返回 database is locked
+            self.connection.execute("PRAGMA busy_timeout = 30000")
+            # WAL 自动检查点阈值（页）
+            self.connection.execute("PRAGMA wal_autocheckpoint = 1000")
         
         self.last_used = time.time()
         return self.connection
@@ -49,21 +67,50 @@ class DatabaseConnection:
             self.connection.close()
             self.connection = None
     
+    def interrupt(self):
+        """中断连接上正在执行的查询（可在任意线程调用）"""
+        connection = self.connection
+        if connection is not None:
+            try:
+                connection.interrupt()
+            except sqlite3.ProgrammingError:
+                pass  # 连接已关闭
+    
     def is_expired(self, timeout: int = 300) -> bool:
         """检查连接是否过期"""
         return time.time() - self.last_used > timeout
 
 
+# sqlite3 在已关闭的连接或其游标上操作时抛出的 ProgrammingError 消息
+_CLOSED_DATABASE_MESSAGE = "Cannot operate on a closed database."
+
+
+def _is_closed_error(error: sqlite3.ProgrammingError) -> bool:
+    """判断错误是否由连接已关闭引起（参数数量不符等用法错误同为 ProgrammingError，不能当作连接失效）"""
+    return str(error) == _CLOSED_DATABASE_MESSAGE
+
+
 class DatabasePool:
     """数据库连接池"""
+
+    # PRAGMA optimize 执行间隔（秒）
+    OPTIMIZE_INTERVAL = 900
+    # WAL 文件超过该大小（字节）时执行截断检查点
+    WAL_CHECKPOINT_THRESHOLD = 64 * 1024 * 1024
     
     def __init__(self, db_path: str, pool_size: int = 10, max_overflow: int = 20):
         self.db_path = db_path
         self.pool_size = pool_size
         self.max_overflow = max_overflow
-        self.pool: List[DatabaseConnection] = []
-        self.overflow: List[DatabaseConnection] = []
+        # 空闲连接栈：deque 的 append/pop 在 GIL 下是原子操作，取还连接无需加锁
+        self.pool: Deque[DatabaseConnection] = deque()
+        # 仅在创建/关闭溢出连接时加锁更新
+        self.overflow_count = 0
         self.lock = threading.Lock()
+        # 使用中的连接（关闭连接池时中断其正在执行的查询）
+        self._in_use: Set[DatabaseConnection] = set()
+        self._closed = False
+        self._stop_event = threading.Event()
         
         # 初始化连接池
         self._initialize_pool()
@@ -80,24 +127,62 @@ class DatabasePool:
     def _start_cleanup_thread(self):
         """启动连接清理线程"""
         def cleanup():
-            while True:
-                time.sleep(60)  # 每分钟清理一次
+            last_optimize = time.time()
+            # 每分钟清理一次，连接池关闭时立即退出
+            while not self._stop_event.wait(timeout=60):
                 self._cleanup_expired_connections()
+                
+                # 定期刷新查询规划器统计信息
+                if time.time() - last_optimize >= self.OPTIMIZE_INTERVAL:
+                    self._optimize()
+                    last_optimize = time.time()
+                
+                # WAL 文件过大时截断
+                self._checkpoint_wal()
         
         cleanup_thread = threading.Thread(target=cleanup, daemon=True)
         cleanup_thread.start()
     
     def _cleanup_expired_connections(self):
-        """清理过期连接"""
-        with self.lock:
-            # 清理溢出连接
-            active_overflow = []
-            for conn in self.overflow:
+        """关闭长时间空闲的池连接（连接对象保留在池中，下次使用时重新建立）"""
+        # 遍历快照并原地关闭，不把连接移出池，避免清理期间取连接时池为空
+        for conn in list(self.pool):
+            if not conn.is_expired():
+                continue
+            # 连接已被取出使用时跳过（使用方在整个使用期间持有连接锁）
+            if not conn.lock.acquire(blocking=False):
+                continue
+            try:
+                # 取锁前可能已被取出并刷新了 last_used，重新检查
                 if conn.is_expired():
                     conn.close()
-                else:
-                    active_overflow.append(conn)
-            self.overflow = active_overflow
+            finally:
+                conn.lock.release()
+    
+    def _optimize(self):
+        """执行 PRAGMA optimize，保持查询规划器统计信息最新"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA optimize")
+            logger.debug("PRAGMA optimize 执行完成")
+        except Exception as e:
+            logger.warning(f"PRAGMA optimize 执行失败: {e}")
+    
+    def _checkpoint_wal(self):
+        """WAL 文件超过阈值时执行截断检查点"""
+        wal_path = self.db_path + "-wal"
+        try:
+            if not os.path.exists(wal_path):
+                return
+            wal_size = os.path.getsize(wal_path)
+            if wal_size <= self.WAL_CHECKPOINT_THRESHOLD:
+                return
+            
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            logger.info(f"WAL 检查点执行完成，截断前大小: {wal_size} 字节")
+        except Exception as e:
+            logger.warning(f"WAL 检查点执行失败: {e}")
     
     @contextmanager
     def get_connection(self):
@@ -105,48 +190,70 @@ class DatabasePool:
         conn = None
         try:
             conn = self._acquire_connection()
-            yield conn.connect()
+            # 使用期间持有连接锁，清理线程不会关闭该连接
+            with conn.lock:
+                self._in_use.add(conn)
+                yield conn.connect()
+        except sqlite3.ProgrammingError as e:
+            # 连接已被关闭时丢弃底层连接，下次使用时重新建立
+            if conn and _is_closed_error(e):
+                conn.close()
+            raise
         finally:
             if conn:
                 self._release_connection(conn)
     
     def _acquire_connection(self) -> DatabaseConnection:
         """获取连接"""
+        # 尝试从池中获取连接
+        try:
+            return self.pool.pop()
+        except IndexError:
+            pass
+        
+        # 池中无可用连接，尝试创建溢出连接
         with self.lock:
-            # 尝试从池中获取连接
-            if self.pool:
-                return self.pool.pop()
-            
-            # 池中无可用连接，尝试创建溢出连接
-            if len(self.overflow) < self.max_overflow:
-                conn = DatabaseConnection(self.db_path)
-                self.overflow.append(conn)
-                return conn
-            
-            # 无法获取连接，等待
-            raise Exception("数据库连接池已满，无法获取连接")
+            if self.overflow_count < self.max_overflow:
+                self.overflow_count += 1
+                return DatabaseConnection(self.db_path, is_overflow=True)
+        
+        # 无法获取连接
+        raise Exception("数据库连接池已满，无法获取连接")
     
     def _release_connection(self, conn: DatabaseConnection):
         """释放连接"""
-        with self.lock:
-            if conn in self.overflow:
-                # 溢出连接直接关闭
-                self.overflow.remove(conn)
-                conn.close()
-            else:
-                # 返回到池中
-                if len(self.pool) < self.pool_size:
-                    self.pool.append(conn)
-                else:
-                    conn.close()
+        self._in_use.discard(conn)
+        if self._closed:
+            # 连接池已关闭，归还的连接直接关闭
+            conn.close()
+            if conn.is_overflow:
+                with self.lock:
+                    self.overflow_count -= 1
+        elif conn.is_overflow:
+            # 溢出连接直接关闭
+            conn.close()
+            with self.lock:
+                self.overflow_count -= 1
+        else:
+            # 返回到池中
+            self.pool.append(conn)
     
     def close_all(self):
-        """关闭所有连接"""
-        with self.lock:
-            for conn in self.pool + self.overflow:
-                conn.close()
-            self.pool.clear()
-            self.overflow.clear()
+        """关闭连接池：中断使用中连接的查询（释放时关闭），并关闭所有空闲连接
+        
+        不在关闭前执行 wal_checkpoint，WAL 内容在下次打开数据库时应用。
+        """
+        self._closed = True
+        self._stop_event.set()
+        for conn in self._in_use.copy():
+            conn.interrupt()
+        
+        while True:
+            try:
+                conn = self.pool.pop()
+            except IndexError:
+                break
+            conn.close()
 
 
 class DatabaseManager:
@@ -155,6 +262,9 @@ class DatabaseManager:
     def __init__(self):
         self.db_path = self._get_db_path()
         self.pool = None
+        # 表结构信息缓存，以 PRAGMA schema_version 判断是否失效（任何 DDL 都会使其递增）
+        self._schema_cache: Dict[str, Any] = {}
+        self._schema_version: Optional[int] = None
         self._initialize_pool()
     
     def _get_db_path(self) -> str:
@@ -180,39 +290,146 @@ class DatabaseManager:
         self.pool = DatabasePool(self.db_path, pool_size, max_overflow)
         logger.info(f"数据库连接池初始化完成: {self.db_path}")
     
+    def _run(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """在池连接上执行操作，连接失效时使用新连接重试一次"""
+        try:
+            with self.pool.get_connection() as conn:
+                return operation(conn)
+        except sqlite3.ProgrammingError as e:
+            if not _is_closed_error(e):
+                raise
+            logger.warning(f"数据库连接失效，重新建立连接后重试: {e}")
+            with self.pool.get_connection() as conn:
+                return operation(conn)
+    
     def execute_query(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
         """执行查询语句"""
+        def operation(conn):
+            rows = conn.execute(query, params).fetchall()
+            return [dict(row) for row in rows]
+        
+        try:
+            return self._run(operation)
+        except Exception as e:
+            logger.error(f"执行查询失败: {query}, 参数: {params}, 错误: {e}")
+            raise
+    
+    def execute_rows(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        """执行查询语句，直接返回 sqlite3.Row 行（不转换为字典，可按序号或列名访问）"""
+        try:
+            return self._run(lambda conn: conn.execute(query, params).fetchall())
+        except Exception as e:
+            logger.error(f"执行查询失败: {query}, 参数: {params}, 错误: {e}")
+            raise
+    
+    def execute_scalar(self, query: str, params: Tuple = ()) -> Any:
+        """执行只返回单个值的查询（如 COUNT），无结果时返回 None"""
+        def operation(conn):
+            row = conn.execute(query, params).fetchone()
+            return row[0] if row is not None else None
+        
+        try:
+            return self._run(operation)
+        except Exception as e:
+            logger.error(f"执行查询失败: {query}, 参数: {params}, 错误: {e}")
+            raise
+    
+    def execute_iter(self, query: str, params: Tuple = (),
+                     batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """逐批读取查询结果，内存占用与结果集大小无关（迭代期间占用一个池连接）"""
         try:
             with self.pool.get_connection() as conn:
                 cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
         except Exception as e:
             logger.error(f"执行查询失败: {query}, 参数: {params}, 错误: {e}")
             raise
     
     def execute_insert(self, query: str, params: Tuple = ()) -> int:
         """执行插入语句，返回插入的行ID"""
+        def operation(conn):
+            cursor = conn.execute(query, params)
+            conn.commit()
+            return cursor.lastrowid
+        
         try:
-            with self.pool.get_connection() as conn:
-                cursor = conn.execute(query, params)
-                conn.commit()
-                return cursor.lastrowid
+            return self._run(operation)
         except Exception as e:
             logger.error(f"执行插入失败: {query}, 参数: {params}, 错误: {e}")
             raise
     
+    def execute_insert_returning(self, query: str, params: Tuple = (),
+                                 returning: str = "id") -> Any:
+        """执行插入语句，通过 RETURNING 子句在同一次执行中返回指定列"""
+        if not SUPPORTS_RETURNING:
+            return self.execute_insert(query, params)
+        
+        returning_query = f"{query.rstrip().rstrip(';')} RETURNING {returning}"
+        
+        def operation(conn):
+            row = conn.execute(returning_query, params).fetchone()
+            conn.commit()
+            return row[0]
+        
+        try:
+            return self._run(operation)
+        except Exception as e:
+            logger.error(f"执行插入失败: {returning_query}, 参数: {params}, 错误: {e}")
+            raise
+    
     def execute_update(self, query: str, params: Tuple = ()) -> int:
         """执行更新语句，返回影响的行数"""
+        def operation(conn):
+            cursor = conn.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+        
         try:
-            with self.pool.get_connection() as conn:
-                cursor = conn.execute(query, params)
-                conn.commit()
-                return cursor.rowcount
+            return self._run(operation)
         except Exception as e:
             logger.error(f"执行更新失败: {query}, 参数: {params}, 错误: {e}")
             raise
     
+    def execute_transaction(self, operations: List[Tuple[str, Tuple]]) -> int:
+        """在单个事务中执行多条语句，返回影响的总行数
+
+        事务以 BEGIN IMMEDIATE 开始，提前获取写锁；连续的相同语句合并为一次 executemany。
+        """
+        # 合并连续的相同语句
+        batches: List[Tuple[str, List[Tuple]]] = []
+        for query, params in operations:
+            if batches and batches[-1][0] == query:
+                batches[-1][1].append(params)
+            else:
+                batches.append((query, [params]))
+
+        def operation(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                affected_rows = 0
+                for query, params_list in batches:
+                    if len(params_list) == 1:
+                        cursor = conn.execute(query, params_list[0])
+                    else:
+                        cursor = conn.executemany(query, params_list)
+                    affected_rows += max(cursor.rowcount, 0)
+                conn.commit()
+                return affected_rows
+            except Exception:
+                conn.rollback()
+                raise
+
+        try:
+            return self._run(operation)
+        except Exception as e:
+            logger.error(f"执行事务失败，语句数: {len(operations)}, 错误: {e}")
+            raise
+
     def execute_script(self, script: str):
         """执行SQL脚本"""
         try:
@@ -237,11 +454,26 @@ class DatabaseManager:
             logger.error(f"数据库连接检查失败: {e}")
             return False
     
+    def _get_schema_cached(self, key: str, query: str) -> List[Dict[str, Any]]:
+        """执行表结构查询，schema_version 未变化时直接返回缓存结果"""
+        def operation(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            if version != self._schema_version:
+                self._schema_cache = {}
+                self._schema_version = version
+            
+            cache = self._schema_cache
+            if key not in cache:
+                cache[key] = [dict(row) for row in conn.execute(query).fetchall()]
+            return cache[key]
+        
+        return list(self._run(operation))
+    
     def get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
         """获取表结构信息"""
         try:
             query = f"PRAGMA table_info({table_name})"
-            return self.execute_query(query)
+            return self._get_schema_cached(f"table_info:{table_name}", query)
         except Exception as e:
             logger.error(f"获取表信息失败: {table_name}, 错误: {e}")
             return []
@@ -250,7 +482,7 @@ class DatabaseManager:
         """获取所有表名"""
         try:
             query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-            rows = self.execute_query(query)
+            rows = self._get_schema_cached("tables", query)
             return [row['name'] for row in rows]
         except Exception as e:
             logger.error(f"获取表列表失败: {e}")
@@ -273,26 +505,39 @@ class DatabaseManager:
             logger.info("数据库连接池已关闭")
 
 
-# 全局数据库管理器实例
-db_manager = DatabaseManager()
+# 全局数据库管理器实例（首次使用时创建）
+_db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
 
 
 # 便捷函数
 def get_db_manager() -> DatabaseManager:
     """获取数据库管理器实例"""
-    return db_manager
+    global _db_manager
+    if _db_manager is None:
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
+    return _db_manager
+
+
+def __getattr__(name: str) -> Any:
+    """兼容 `from app.core.database import db_manager` 的旧用法（延迟创建）"""
+    if name == "db_manager":
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def execute_query(query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
     """执行查询的便捷函数"""
-    return db_manager.execute_query(query, params)
+    return get_db_manager().execute_query(query, params)
 
 
 def execute_insert(query: str, params: Tuple = ()) -> int:
     """执行插入的便捷函数"""
-    return db_manager.execute_insert(query, params)
+    return get_db_manager().execute_insert(query, params)
 
 
 def execute_update(query: str, params: Tuple = ()) -> int:
     """执行更新的便捷函数"""
-    return db_manager.execute_update(query, params)
+    return get_db_manager().execute_update(query, params)
@@ -6,9 +6,9 @@ import logging
 import logging.handlers
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Optional
-from datetime import datetime
 import inspect
 
 
@@ -110,13 +110,14 @@ class LoggerManager:
 
     def __init__(self):
         self.loggers = {}
+        # 日志目录（创建一次，后续添加文件处理器时直接使用）
+        self.log_dir = Path("logs")
+        self.log_dir.mkdir(exist_ok=True)
         self.setup_root_logger()
 
     def setup_root_logger(self):
         """设置根日志器"""
-        # 创建日志目录
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
+        log_dir = self.log_dir
 
         # 根日志器配置
         root_logger = logging.getLogger()
@@ -197,7 +198,7 @@ class LoggerManager:
 
         # 创建文件处理器
         file_handler = logging.handlers.RotatingFileHandler(
-            f"logs/{filename}",
+            self.log_dir / filename,
             maxBytes=10*1024*1024,  # 10MB
             backupCount=3,
             encoding='utf-8'
@@ -292,8 +293,7 @@ def configure_logger(name: str,
 
     # 文件处理器
     if enable_file:
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
+        log_dir = logger_manager.log_dir
 
         filename = log_file or f"{name.lower()}.log"
         file_handler = logging.handlers.RotatingFileHandler(
@@ -318,21 +318,21 @@ def configure_logger(name: str,
 def log_performance(logger_name: str = "Performance"):
     """性能日志装饰器"""
     def decorator(func):
+        # 在装饰时获取一次日志器，避免每次调用都查找
+        logger = get_logger(logger_name)
+        
         def wrapper(*args, **kwargs):
-            logger = get_logger(logger_name)
-            start_time = datetime.now()
+            start_time = time.perf_counter()
             
             try:
                 result = func(*args, **kwargs)
-                end_time = datetime.now()
-                duration = (end_time - start_time).total_seconds()
-                
-                logger.info(f"{func.__name__} 执行完成，耗时: {duration:.3f}秒")
+                if logger.isEnabledFor(logging.INFO):
+                    duration = time.perf_counter() - start_time
+                    logger.info(f"{func.__name__} 执行完成，耗时: {duration:.3f}秒")
                 return result
                 
             except Exception as e:
-                end_time = datetime.now()
-                duration = (end_time - start_time).total_seconds()
+                duration = time.perf_counter() - start_time
                 
                 logger.error(f"{func.__name__} 执行失败，耗时: {duration:.3f}秒，错误: {str(e)}")
                 raise
@@ -5,7 +5,7 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any, TypeVar, Generic
 from datetime import datetime
 
-from app.core.database import db_manager
+from app.core.database import DatabaseManager, get_db_manager
 from app.core.logger import get_logger
 
 logger = get_logger("DAO")
@@ -18,7 +18,11 @@ class BaseDAO(ABC, Generic[T]):
     
     def __init__(self, table_name: str):
         self.table_name = table_name
-        self.db = db_manager
+    
+    @property
+    def db(self) -> DatabaseManager:
+        """数据库管理器（首次访问时创建）"""
+        return get_db_manager()
     
     @abstractmethod
     def _row_to_model(self, row: Dict[str, Any]) -> T:
@@ -70,9 +74,8 @@ class BaseDAO(ABC, Generic[T]):
     def count_all(self) -> int:
         """统计总记录数"""
         try:
-            query = f"SELECT COUNT(*) as count FROM {self.table_name}"
-            rows = self.db.execute_query(query)
-            return rows[0]['count'] if rows else 0
+            query = f"SELECT COUNT(*) FROM {self.table_name}"
+            return self.db.execute_scalar(query)
         except Exception as e:
             logger.error(f"统计记录数失败，表: {self.table_name}, 错误: {e}")
             return 0
@@ -1,10 +1,11 @@
 """
 系统事件数据访问对象
 """
+import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from app.models import SystemEvent, SystemEventCreate, SystemEventQuery
+from app.models import SystemEvent, SystemEventCreate, SystemEventQuery, EventType, EventSource
 from app.core.logger import get_logger
 from .base import BaseDAO, TimestampMixin
 
@@ -14,8 +15,18 @@ logger = get_logger("SystemEventDAO")
 class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
     """系统事件数据访问对象"""
     
+    # 批量插入时单条语句的最大行数（6 个参数/行，远低于 SQLite 默认 32766 个参数上限）
+    BULK_INSERT_ROWS = 500
+    
     def __init__(self):
         super().__init__("system_events")
+        # 批量插入语句只构建一次：整块使用多行 VALUES，剩余行使用单行语句 + executemany
+        columns = "(event_type, event_time, event_source, details, processed, created_at)"
+        self._insert_row_sql = f"INSERT INTO {self.table_name} {columns} VALUES (?, ?, ?, ?, ?, ?)"
+        self._insert_chunk_sql = (
+            f"INSERT INTO {self.table_name} {columns} VALUES "
+            + ", ".join(["(?, ?, ?, ?, ?, ?)"] * self.BULK_INSERT_ROWS)
+        )
     
     def create(self, event: SystemEventCreate) -> int:
         """创建系统事件"""
@@ -41,7 +52,7 @@ class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
                 VALUES ({', '.join(placeholders)})
             """
             
-            event_id = self.db.execute_insert(query, tuple(data.values()))
+            event_id = self.db.execute_insert_returning(query, tuple(data.values()))
             logger.info(f"创建系统事件成功，ID: {event_id}")
             return event_id
             
@@ -49,6 +60,43 @@ class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
             logger.error(f"创建系统事件失败: {e}")
             raise
     
+    def create_many(self, events: List[SystemEventCreate]) -> int:
+        """批量创建系统事件（单个事务），返回创建数量"""
+        try:
+            if not events:
+                return 0
+            
+            now = datetime.now().isoformat()
+            rows = [
+                (
+                    event.event_type.value,
+                    event.event_time.isoformat(),
+                    event.event_source.value,
+                    event.details,
+                    event.processed,
+                    now
+                )
+                for event in events
+            ]
+            
+            # 满 BULK_INSERT_ROWS 行的整块使用多行 VALUES 语句；不足一块的剩余行使用同一条单行
+            # 语句，由 execute_transaction 合并为 executemany。两条语句都固定不变，只需预编译一次
+            operations = []
+            full_rows = len(rows) - len(rows) % self.BULK_INSERT_ROWS
+            for start in range(0, full_rows, self.BULK_INSERT_ROWS):
+                chunk = rows[start:start + self.BULK_INSERT_ROWS]
+                operations.append((self._insert_chunk_sql, tuple(v for row in chunk for v in row)))
+            operations.extend((self._insert_row_sql, row) for row in rows[full_rows:])
+            
+            count = self.db.execute_transaction(operations)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"批量创建系统事件成功，数量: {count}")
+            return count
+            
+        except Exception as e:
+            logger.error(f"批量创建系统事件失败: {e}")
+            raise
+    
     def mark_processed(self, event_id: int) -> bool:
         """标记事件为已处理"""
         try:
@@ -98,7 +146,7 @@ class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
             
             if query_params.event_type:
                 conditions.append("event_type = ?")
-                params.append(query_params.event_type.value)
+                params.append(query_params.event_type)
             
             if query_params.start_time:
                 conditions.append("event_time >= ?")
@@ -135,7 +183,7 @@ class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
             
             if query_params.event_type:
                 conditions.append("event_type = ?")
-                params.append(query_params.event_type.value)
+                params.append(query_params.event_type)
             
             if query_params.start_time:
                 conditions.append("event_time >= ?")
@@ -150,10 +198,9 @@ class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
                 params.append(query_params.processed)
             
             where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-            query = f"SELECT COUNT(*) as count FROM {self.table_name}{where_clause}"
+            query = f"SELECT COUNT(*) FROM {self.table_name}{where_clause}"
             
-            rows = self.db.execute_query(query, tuple(params))
-            return rows[0]['count'] if rows else 0
+            return self.db.execute_scalar(query, tuple(params))
             
         except Exception as e:
             logger.error(f"统计系统事件数量失败: {e}")
@@ -208,9 +255,8 @@ class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
             where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
             
             # 总体统计
-            total_query = f"SELECT COUNT(*) as total FROM {self.table_name}{where_clause}"
-            total_rows = self.db.execute_query(total_query, tuple(params))
-            total_events = total_rows[0]['total'] if total_rows else 0
+            total_query = f"SELECT COUNT(*) FROM {self.table_name}{where_clause}"
+            total_events = self.db.execute_scalar(total_query, tuple(params))
             
             # 按类型统计
             type_query = f"""
@@ -258,12 +304,12 @@ class SystemEventDAO(BaseDAO[SystemEvent], TimestampMixin):
             raise
     
     def _row_to_model(self, row: Dict[str, Any]) -> SystemEvent:
-        """将数据库行转换为模型对象"""
-        return SystemEvent(
+        """将数据库行转换为模型对象（数据来自本库，字段已在此转换，跳过校验）"""
+        return SystemEvent.model_construct(
             id=row['id'],
-            event_type=row['event_type'],
+            event_type=EventType.from_raw(row['event_type']),
             event_time=datetime.fromisoformat(row['event_time']),
-            event_source=row['event_source'],
+            event_source=EventSource.from_raw(row['event_source']),
             details=row['details'],
             processed=bool(row['processed']),
             created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
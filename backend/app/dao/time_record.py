@@ -1,10 +1,10 @@
 """
 工时记录数据访问对象
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from datetime import datetime, date
 
-from app.models import TimeRecord, TimeRecordCreate, TimeRecordUpdate, TimeRecordQuery
+from app.models import TimeRecord, TimeRecordCreate, TimeRecordUpdate, TimeRecordQuery, RecordStatus
 from app.core.logger import get_logger
 from .base import BaseDAO, TimestampMixin
 
@@ -20,17 +20,21 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
     def create(self, record: TimeRecordCreate) -> int:
         """创建工时记录"""
         try:
-            # 计算工作时长
-            record.calculate_duration()
+            # 计算工作时长（不修改传入的模型）
+            duration, overtime_duration = record.duration, record.overtime_duration
+            if record.clock_in and record.clock_out:
+                duration, overtime_duration = record.compute(
+                    record.clock_in, record.clock_out, record.break_duration
+                )
             
             # 准备数据
             data = {
                 "date": record.date.isoformat(),
                 "clock_in": record.clock_in.isoformat() if record.clock_in else None,
                 "clock_out": record.clock_out.isoformat() if record.clock_out else None,
-                "duration": record.duration,
+                "duration": duration,
                 "break_duration": record.break_duration,
-                "overtime_duration": record.overtime_duration,
+                "overtime_duration": overtime_duration,
                 "status": record.status.value,
                 "notes": record.notes
             }
@@ -47,7 +51,7 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
                 VALUES ({', '.join(placeholders)})
             """
             
-            record_id = self.db.execute_insert(query, tuple(data.values()))
+            record_id = self.db.execute_insert_returning(query, tuple(data.values()))
             logger.info(f"创建工时记录成功，ID: {record_id}")
             return record_id
             
@@ -102,27 +106,42 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
             logger.error(f"更新工时记录失败，ID: {record_id}, 错误: {e}")
             raise
     
+    def _build_where(self, query_params: TimeRecordQuery) -> Tuple[str, tuple]:
+        """根据查询参数构建 WHERE 子句和参数"""
+        conditions = []
+        params = []
+        
+        if query_params.start_date:
+            conditions.append("date >= ?")
+            params.append(query_params.start_date.isoformat())
+        
+        if query_params.end_date:
+            conditions.append("date <= ?")
+            params.append(query_params.end_date.isoformat())
+        
+        if query_params.status:
+            conditions.append("status = ?")
+            params.append(query_params.status)
+        
+        where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where_clause, tuple(params)
+    
+    def iter_records(self, query_params: TimeRecordQuery) -> Iterator[Dict[str, Any]]:
+        """按查询条件逐行读取工时记录（不分页，用于导出）"""
+        where_clause, params = self._build_where(query_params)
+        order_clause = f" ORDER BY {query_params.order_by}"
+        if query_params.order_desc:
+            order_clause += " DESC"
+        
+        query = f"SELECT * FROM {self.table_name}{where_clause}{order_clause}"
+        return self.db.execute_iter(query, params)
+    
     def list_records(self, query_params: TimeRecordQuery) -> List[TimeRecord]:
         """查询工时记录列表"""
         try:
-            # 构建查询条件
-            conditions = []
-            params = []
-            
-            if query_params.start_date:
-                conditions.append("date >= ?")
-                params.append(query_params.start_date.isoformat())
-            
-            if query_params.end_date:
-                conditions.append("date <= ?")
-                params.append(query_params.end_date.isoformat())
-            
-            if query_params.status:
-                conditions.append("status = ?")
-                params.append(query_params.status.value)
+            where_clause, params = self._build_where(query_params)
             
             # 构建查询语句
-            where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
             order_clause = f" ORDER BY {query_params.order_by}"
             if query_params.order_desc:
                 order_clause += " DESC"
@@ -132,7 +151,7 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
             
             query = f"SELECT * FROM {self.table_name}{where_clause}{order_clause}{limit_clause}"
             
-            rows = self.db.execute_query(query, tuple(params))
+            rows = self.db.execute_query(query, params)
             return [self._row_to_model(row) for row in rows]
             
         except Exception as e:
@@ -142,27 +161,11 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
     def count_records(self, query_params: TimeRecordQuery) -> int:
         """统计工时记录数量"""
         try:
-            # 构建查询条件
-            conditions = []
-            params = []
+            where_clause, params = self._build_where(query_params)
             
-            if query_params.start_date:
-                conditions.append("date >= ?")
-                params.append(query_params.start_date.isoformat())
+            query = f"SELECT COUNT(*) FROM {self.table_name}{where_clause}"
             
-            if query_params.end_date:
-                conditions.append("date <= ?")
-                params.append(query_params.end_date.isoformat())
-            
-            if query_params.status:
-                conditions.append("status = ?")
-                params.append(query_params.status.value)
-            
-            where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-            query = f"SELECT COUNT(*) as count FROM {self.table_name}{where_clause}"
-            
-            rows = self.db.execute_query(query, tuple(params))
-            return rows[0]['count'] if rows else 0
+            return self.db.execute_scalar(query, params)
             
         except Exception as e:
             logger.error(f"统计工时记录数量失败: {e}")
@@ -182,6 +185,23 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
             logger.error(f"获取日期范围记录失败: {start_date} - {end_date}, 错误: {e}")
             raise
     
+    def list_raw(self, start_date: date, end_date: date) -> List[Any]:
+        """获取日期范围内用于统计的原始行（不构建模型）
+        
+        每行依次为 (date, duration, overtime_duration, break_duration, status)，date 为 ISO 字符串
+        """
+        try:
+            query = f"""
+                SELECT date, duration, overtime_duration, break_duration, status
+                FROM {self.table_name}
+                WHERE date >= ? AND date <= ?
+                ORDER BY date ASC
+            """
+            return self.db.execute_rows(query, (start_date.isoformat(), end_date.isoformat()))
+        except Exception as e:
+            logger.error(f"获取日期范围统计数据失败: {start_date} - {end_date}, 错误: {e}")
+            raise
+    
     def get_monthly_records(self, year: int, month: int) -> List[TimeRecord]:
         """获取月度记录"""
         try:
@@ -245,8 +265,8 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
             raise
     
     def _row_to_model(self, row: Dict[str, Any]) -> TimeRecord:
-        """将数据库行转换为模型对象"""
-        return TimeRecord(
+        """将数据库行转换为模型对象（数据来自本库，字段已在此转换，跳过校验）"""
+        return TimeRecord.model_construct(
             id=row['id'],
             date=date.fromisoformat(row['date']),
             clock_in=datetime.fromisoformat(row['clock_in']) if row['clock_in'] else None,
@@ -254,7 +274,7 @@ class TimeRecordDAO(BaseDAO[TimeRecord], TimestampMixin):
             duration=row['duration'],
             break_duration=row['break_duration'],
             overtime_duration=row['overtime_duration'],
-            status=row['status'],
+            status=RecordStatus.from_raw(row['status']),
             notes=row['notes'],
             created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
             updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None
@@ -1,7 +1,10 @@
 """
 事件监听器包
 """
-from .base import EventListener, SystemEventData, EventQueue, EventManager, event_manager
+from .base import (
+    EventListener, SystemEventData, EventQueue, EventManager, get_event_manager,
+    is_event_manager_running, reload_event_filter
+)
 from .platform import (
     MultiPlatformEventListener, PlatformEventListenerFactory,
     create_platform_listener
@@ -16,8 +19,16 @@ except ImportError:
 
 __all__ = [
     # 基础组件
-    "EventListener", "SystemEventData", "EventQueue", "EventManager", "event_manager",
+    "EventListener", "SystemEventData", "EventQueue", "EventManager", "get_event_manager",
+    "is_event_manager_running", "reload_event_filter",
 
     # 跨平台组件
     "MultiPlatformEventListener", "PlatformEventListenerFactory", "create_platform_listener"
-] + __all_windows__
\ No newline at end of file
+] + __all_windows__
+
+
+def __getattr__(name):
+    """兼容 `from app.listeners import event_manager` 的旧用法（延迟创建）"""
+    if name == "event_manager":
+        return get_event_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
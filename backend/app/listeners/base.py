@@ -1,33 +1,90 @@
 """
 基础事件监听器
 """
+import atexit
+import logging
 import platform
 import threading
-import queue
 import time
+import weakref
+from collections import deque
 from abc import ABC, abstractmethod
 from typing import Dict, List, Callable, Optional, Any
 from datetime import datetime
 
 from app.models import EventType, EventSource, SystemEventCreate
 from app.core.logger import get_logger
+from app.config.settings import get_config
 
 logger = get_logger("EventListener")
 
+# 当前平台名称（进程内不变，导入时计算一次）
+_PLATFORM = platform.system()
+
+# 运行中的监听器
+_active_listeners: "weakref.WeakSet[EventListener]" = weakref.WeakSet()
+
+
+# 处理线程运行中的事件队列（解释器退出前写出其中剩余的事件）
+_processing_queues: "weakref.WeakSet[EventQueue]" = weakref.WeakSet()
+
+
+def _shutdown():
+    """解释器退出前先停止所有运行中的监听器（经由各自的 stop 唤醒原生消息循环），
+    再停止事件队列并写出剩余事件，监听器停止过程中上报的事件（如 SHUTDOWN）也会落库
+    """
+    for listener in list(_active_listeners):
+        try:
+            listener.stop()
+        except Exception as e:
+            logger.error(f"停止监听器 {listener.name} 失败: {e}")
+    
+    for event_queue in list(_processing_queues):
+        try:
+            event_queue.stop_processing()
+        except Exception as e:
+            logger.error(f"停止事件队列失败: {e}")
+
+
+atexit.register(_shutdown)
+
 
 class SystemEventData:
     """系统事件数据结构"""
     
+    __slots__ = ("event_type", "_event_time", "_timestamp", "source", "details",
+                 "platform_info", "raw_data")
+    
     def __init__(self, event_type: EventType, event_time: datetime = None, 
                  source: EventSource = EventSource.SYSTEM, details: str = None,
                  platform_info: str = None, raw_data: Any = None):
         self.event_type = event_type
-        self.event_time = event_time or datetime.now()
+        # 未指定事件时间时只记录时间戳，首次访问 event_time 时再转换为 datetime
+        self._event_time = event_time
+        self._timestamp = time.time() if event_time is None else None
         self.source = source
         self.details = details
-        self.platform_info = platform_info or platform.system()
+        self.platform_info = platform_info or _PLATFORM
         self.raw_data = raw_data
     
+    @property
+    def event_time(self) -> datetime:
+        """事件时间"""
+        if self._event_time is None:
+            self._event_time = datetime.fromtimestamp(self._timestamp)
+        return self._event_time
+    
+    @event_time.setter
+    def event_time(self, value: datetime):
+        self._event_time = value
+    
+    @property
+    def timestamp(self) -> float:
+        """事件时间戳（秒）"""
+        if self._timestamp is None:
+            self._timestamp = self._event_time.timestamp()
+        return self._timestamp
+    
     def to_create_model(self) -> SystemEventCreate:
         """转换为数据库创建模型"""
         return SystemEventCreate(
@@ -48,25 +105,33 @@ class EventListener(ABC):
         self.name = name
         self.is_running = False
         self.callbacks: List[Callable[[SystemEventData], None]] = []
+        # 回调快照（写时复制），通知时无需加锁
+        self._callbacks_snapshot: tuple = ()
+        self._callbacks_lock = threading.Lock()
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
     
     def add_callback(self, callback: Callable[[SystemEventData], None]):
         """添加事件回调函数"""
-        self.callbacks.append(callback)
+        with self._callbacks_lock:
+            self.callbacks.append(callback)
+            self._callbacks_snapshot = tuple(self.callbacks)
     
     def remove_callback(self, callback: Callable[[SystemEventData], None]):
         """移除事件回调函数"""
-        if callback in self.callbacks:
-            self.callbacks.remove(callback)
+        with self._callbacks_lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
+                self._callbacks_snapshot = tuple(self.callbacks)
     
     def _notify_callbacks(self, event_data: SystemEventData):
         """通知所有回调函数"""
-        for callback in self.callbacks:
+        log_error = logger.error
+        for callback in self._callbacks_snapshot:
             try:
                 callback(event_data)
             except Exception as e:
-                logger.error(f"事件回调执行失败: {e}")
+                log_error(f"事件回调执行失败: {e}")
     
     def start(self):
         """启动监听器"""
@@ -76,7 +141,11 @@ class EventListener(ABC):
         
         self.is_running = True
         self._stop_event.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        _active_listeners.add(self)
+        # 守护线程：原生消息循环阻塞时也不会妨碍解释器退出
+        self._thread = threading.Thread(
+            target=self._run, name=f"EventListener-{self.name}", daemon=True
+        )
         self._thread.start()
         logger.info(f"监听器 {self.name} 已启动")
     
@@ -87,9 +156,13 @@ class EventListener(ABC):
         
         self.is_running = False
         self._stop_event.set()
+        _active_listeners.discard(self)
         
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
+            if self._thread.is_alive():
+                logger.warning(f"监听器 {self.name} 未在超时时间内退出")
+        self._thread = None
         
         logger.info(f"监听器 {self.name} 已停止")
     
@@ -107,21 +180,62 @@ class EventListener(ABC):
 class EventQueue:
     """事件队列管理器"""
     
-    def __init__(self, max_size: int = 1000):
-        self._queue = queue.Queue(maxsize=max_size)
+    def __init__(self, max_size: int = 1000, batch_size: int = 256,
+                 batch_window: float = 0.01):
+        # 单消费者队列：deque 的 append/popleft 在 GIL 下是原子操作；
+        # 不设 maxlen，容量由 put 显式控制，避免 deque 静默丢弃最早的事件
+        self._dq: deque = deque()
+        self._max_size = max_size
+        # 多个监听器线程会同时调用 put，容量检查、淘汰和入队需要在同一把锁内完成
+        self._put_lock = threading.Lock()
+        self._not_empty = threading.Event()
+        self._dropped = 0  # 因队列已满被丢弃的事件数
+        self.batch_size = batch_size  # 单批最大事件数
+        self.batch_window = batch_window  # 收到首个事件后的攒批窗口（秒）
         self._processing = False
         self._processor_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
     
     def put(self, event_data: SystemEventData):
         """添加事件到队列"""
-        try:
-            self._queue.put_nowait(event_data)
+        dropped = None
+        with self._put_lock:
+            if len(self._dq) >= self._max_size:
+                dropped = self._evict()
+            self._dq.append(event_data)
+        self._not_empty.set()
+        
+        if dropped is not None:
+            logger.warning(f"事件队列已满，丢弃事件: {dropped}")
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"事件已加入队列: {event_data}")
-        except queue.Full:
-            logger.warning("事件队列已满，丢弃事件")
     
-    def start_processing(self, processor: Callable[[SystemEventData], None]):
+    def _evict(self) -> Optional[SystemEventData]:
+        """队列已满时淘汰最早的连续重复事件，没有重复事件时淘汰最早的事件
+        
+        所有事件类型都是工时计算依赖的状态变化；与前一个事件类型相同的事件不改变状态，
+        淘汰它不会丢失状态变化。调用方需持有 _put_lock，返回被丢弃的事件
+        """
+        dropped = None
+        try:
+            previous_type = None
+            for queued in self._dq:
+                if queued.event_type is previous_type:
+                    dropped = queued
+                    break
+                previous_type = queued.event_type
+            if dropped is not None:
+                self._dq.remove(dropped)
+            else:
+                dropped = self._dq.popleft()
+        except (RuntimeError, ValueError, IndexError):
+            # 生产者已被锁串行化，只可能是处理线程同时取走了事件，队列已有空位
+            return None
+        
+        self._dropped += 1
+        return dropped
+    
+    def start_processing(self, processor: Callable[[List[SystemEventData]], None]):
         """启动事件处理"""
         if self._processing:
             return
@@ -134,6 +248,7 @@ class EventQueue:
             daemon=True
         )
         self._processor_thread.start()
+        _processing_queues.add(self)
         logger.info("事件队列处理器已启动")
     
     def stop_processing(self):
@@ -143,51 +258,137 @@ class EventQueue:
         
         self._processing = False
         self._stop_event.set()
+        self._not_empty.set()  # 唤醒等待中的处理线程
+        _processing_queues.discard(self)
         
         if self._processor_thread and self._processor_thread.is_alive():
             self._processor_thread.join(timeout=5.0)
         
         logger.info("事件队列处理器已停止")
     
-    def _process_events(self, processor: Callable[[SystemEventData], None]):
+    def _process_events(self, processor: Callable[[List[SystemEventData]], None]):
         """处理事件队列"""
         while self._processing and not self._stop_event.is_set():
             try:
-                # 批量处理事件
-                events = []
-                
-                # 收集一批事件
-                try:
-                    # 等待第一个事件
-                    event = self._queue.get(timeout=1.0)
-                    events.append(event)
-                    
-                    # 收集更多事件（非阻塞）
-                    while len(events) < 10:  # 批量大小限制
-                        try:
-                            event = self._queue.get_nowait()
-                            events.append(event)
-                        except queue.Empty:
-                            break
-                
-                except queue.Empty:
+                # 队列为空时等待新事件（先清除标志再复查，避免丢失唤醒）
+                if not self._dq:
+                    self._not_empty.clear()
+                    if not self._dq:
+                        self._not_empty.wait(timeout=1.0)
                     continue
                 
-                # 处理事件批次
-                for event in events:
+                # 在攒批窗口内取出已有事件，直到队列为空或达到批量上限
+                events = []
+                deadline = time.monotonic() + self.batch_window
+                while len(events) < self.batch_size:
                     try:
-                        processor(event)
-                        self._queue.task_done()
-                    except Exception as e:
-                        logger.error(f"事件处理失败: {e}")
-                        self._queue.task_done()
+                        events.append(self._dq.popleft())
+                    except IndexError:
+                        break
+                    if time.monotonic() >= deadline:
+                        break
+                
+                # 整批交给处理器，一次事务写入
+                self._dispatch(processor, events)
                 
             except Exception as e:
                 logger.error(f"事件队列处理异常: {e}")
+        
+        # 停止前写出队列中剩余的事件
+        self._drain(processor)
+    
+    def _drain(self, processor: Callable[[List[SystemEventData]], None]):
+        """按批次处理队列中剩余的全部事件"""
+        while self._dq:
+            events = []
+            while len(events) < self.batch_size:
+                try:
+                    events.append(self._dq.popleft())
+                except IndexError:
+                    break
+            if events:
+                self._dispatch(processor, events)
+    
+    def _dispatch(self, processor: Callable[[List[SystemEventData]], None],
+                  events: List[SystemEventData]):
+        """将一批事件交给处理器"""
+        try:
+            processor(events)
+        except Exception as e:
+            logger.error(f"事件处理失败: {e}")
     
     def size(self) -> int:
         """获取队列大小"""
-        return self._queue.qsize()
+        return len(self._dq)
+    
+    def dropped_count(self) -> int:
+        """获取因队列已满被丢弃的事件数"""
+        return self._dropped
+
+
+class EventFilter:
+    """事件过滤器（按配置的启用类型过滤，并在最小间隔内去除连续重复的事件）"""
+    
+    def __init__(self):
+        # 过滤设置快照（可直接序列化为 JSON），设置变化时整体替换而不是原地修改
+        self._settings_snapshot: Dict[str, Any] = {"enabled_types": [], "min_intervals": {}}
+        self._load_config()
+        # 最近一次被处理的事件类型及时间戳（秒）
+        self.last_event_type: Optional[EventType] = None
+        self.last_event_time: float = 0.0
+    
+    def _load_config(self):
+        """从配置加载启用的事件类型和最小间隔"""
+        members = EventType.__members__
+        enabled = [members[name] for name in get_config("event.enabled_types", []) if name in members]
+        self.set_enabled_types(enabled)
+        self.set_min_intervals({
+            members[name]: float(interval)
+            for name, interval in get_config("event.min_intervals", {}).items()
+            if name in members
+        })
+    
+    def set_enabled_types(self, event_types: List[EventType]):
+        """设置启用的事件类型（为空时处理所有事件）"""
+        self.enabled_types = frozenset(event_types or EventType)
+        self._settings_snapshot = {
+            **self._settings_snapshot,
+            "enabled_types": [
+                event_type.value for event_type in EventType if event_type in self.enabled_types
+            ]
+        }
+    
+    def set_min_intervals(self, min_intervals: Dict[EventType, float]):
+        """设置各事件类型的最小间隔（秒）"""
+        self.min_intervals: Dict[EventType, float] = dict(min_intervals)
+        self._settings_snapshot = {
+            **self._settings_snapshot,
+            "min_intervals": {
+                event_type.value: interval for event_type, interval in self.min_intervals.items()
+            }
+        }
+    
+    def get_settings(self) -> Dict[str, Any]:
+        """获取过滤设置（普通字典快照，仅在设置变化时重建，调用方不应修改）"""
+        return self._settings_snapshot
+    
+    def should_process(self, event_data: SystemEventData) -> bool:
+        """判断事件是否需要处理"""
+        event_type = event_data.event_type
+        if event_type not in self.enabled_types:
+            return False
+        
+        # 只丢弃与上一个已处理事件类型相同且间隔过短的重复事件，
+        # 中间夹有其他类型（如 锁屏-解锁-锁屏）时都是真实的状态变化
+        ts = event_data.timestamp
+        if event_type is self.last_event_type:
+            min_interval = self.min_intervals.get(event_type)
+            if min_interval is not None and ts - self.last_event_time < min_interval:
+                return False
+        
+        self.last_event_type = event_type
+        self.last_event_time = ts
+        return True
 
 
 class EventManager:
@@ -196,10 +397,11 @@ class EventManager:
     def __init__(self):
         self.listeners: Dict[str, EventListener] = {}
         self.event_queue = EventQueue()
+        self.event_filter = EventFilter()
         self.is_running = False
         
-        # 启动事件处理
-        self.event_queue.start_processing(self._handle_event)
+        # 启动事件处理（解释器退出前由 _shutdown 在监听器停止后写出剩余事件）
+        self.event_queue.start_processing(self._handle_events)
     
     def register_listener(self, listener: EventListener):
         """注册事件监听器"""
@@ -241,21 +443,32 @@ class EventManager:
     
     def _on_event_received(self, event_data: SystemEventData):
         """接收到事件时的回调"""
+        if not self.event_filter.should_process(event_data):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"事件 {event_data.event_type} 间隔过短或未启用，跳过处理")
+            return
+        
         self.event_queue.put(event_data)
     
-    def _handle_event(self, event_data: SystemEventData):
-        """处理单个事件"""
+    def _handle_events(self, events: List[SystemEventData]):
+        """批量处理事件"""
         try:
-            # 记录到数据库
+            # 批量记录到数据库（单个事务）
             from app.dao import system_event_dao
-            create_model = event_data.to_create_model()
-            event_id = system_event_dao.create(create_model)
+            create_models = [event_data.to_create_model() for event_data in events]
+            count = system_event_dao.create_many(create_models)
             
-            logger.info(f"系统事件已记录: {event_data} (ID: {event_id})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"系统事件已记录: {count} 条")
             
         except Exception as e:
             logger.error(f"处理系统事件失败: {e}")
     
+    @property
+    def queue_size(self) -> int:
+        """待处理事件数"""
+        return self.event_queue.size()
+    
     def get_status(self) -> Dict[str, Any]:
         """获取管理器状态"""
         return {
@@ -264,9 +477,42 @@ class EventManager:
                 name: listener.is_running 
                 for name, listener in self.listeners.items()
             },
-            "queue_size": self.event_queue.size()
+            "queue_size": self.queue_size,
+            "dropped_events": self.event_queue.dropped_count(),
+            "filter_settings": self.event_filter.get_settings()
         }
 
 
-# 全局事件管理器实例
-event_manager = EventManager()
+# 全局事件管理器实例（首次使用时创建，避免导入时启动处理线程）
+_event_manager: Optional[EventManager] = None
+_event_manager_lock = threading.Lock()
+
+
+def get_event_manager() -> EventManager:
+    """获取事件管理器实例"""
+    global _event_manager
+    if _event_manager is None:
+        with _event_manager_lock:
+            if _event_manager is None:
+                _event_manager = EventManager()
+    return _event_manager
+
+
+def is_event_manager_running() -> bool:
+    """事件管理器是否在运行（尚未创建时视为未运行，不会因查询而创建实例）"""
+    manager = _event_manager
+    return manager is not None and manager.is_running
+
+
+def reload_event_filter():
+    """配置变更后重新加载运行中事件管理器的过滤设置（尚未创建时无需处理）"""
+    manager = _event_manager
+    if manager is not None:
+        manager.event_filter._load_config()
+
+
+def __getattr__(name: str) -> Any:
+    """兼容 `from app.listeners.base import event_manager` 的旧用法（延迟创建）"""
+    if name == "event_manager":
+        return get_event_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
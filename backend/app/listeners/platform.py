@@ -2,8 +2,9 @@
 跨平台事件监听器
 根据当前平台自动选择合适的事件监听器
 """
+import asyncio
+import os
 import platform
-import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -36,7 +37,9 @@ class GenericEventListener(EventListener):
         # 定期检查（保持监听器活跃）
         while self.is_running and not self._stop_event.is_set():
             try:
-                time.sleep(self.check_interval)
+                # 等待检查间隔，停止时立即返回
+                if self._stop_event.wait(timeout=self.check_interval):
+                    break
                 
                 # 可以在这里添加一些通用的检查逻辑
                 # 比如检查系统负载、网络状态等
@@ -57,10 +60,16 @@ class GenericEventListener(EventListener):
 
 
 class MacOSEventListener(EventListener):
-    """macOS事件监听器（占位符）"""
+    """macOS事件监听器（基于 NSWorkspace / NSDistributedNotificationCenter 通知）"""
+    
+    # 分布式通知：屏幕锁定/解锁
+    SCREEN_LOCKED = "com.apple.screenIsLocked"
+    SCREEN_UNLOCKED = "com.apple.screenIsUnlocked"
     
     def __init__(self):
         super().__init__("MacOSEventListener")
+        self._cf_run_loop = None
+        self._observers = []
     
     def get_supported_events(self) -> List[EventType]:
         """获取支持的事件类型"""
@@ -74,32 +83,93 @@ class MacOSEventListener(EventListener):
         ]
     
     def _run(self):
-        """监听器主循环"""
-        logger.info("macOS事件监听器启动（待实现）")
-        
-        # TODO: 实现macOS特定的事件监听
-        # 可以使用PyObjC和NSWorkspace notifications
+        """监听器主循环：阻塞在当前线程的 RunLoop 上，仅在收到系统通知时唤醒"""
+        logger.info("macOS事件监听器启动")
         
         # 发送启动事件
+        self._notify_event(EventType.STARTUP, "macOS应用程序启动")
+        
+        try:
+            from AppKit import (
+                NSWorkspace, NSWorkspaceWillSleepNotification,
+                NSWorkspaceDidWakeNotification, NSWorkspaceWillPowerOffNotification
+            )
+            from Foundation import (
+                NSDistributedNotificationCenter, NSRunLoop, NSDate, NSDefaultRunLoopMode
+            )
+            from CoreFoundation import CFRunLoopGetCurrent
+        except ImportError:
+            logger.warning("未安装 PyObjC，macOS 锁屏/休眠事件不可用")
+            self._stop_event.wait()
+            return
+        
+        try:
+            workspace_center = NSWorkspace.sharedWorkspace().notificationCenter()
+            distributed_center = NSDistributedNotificationCenter.defaultCenter()
+            
+            subscriptions = [
+                (workspace_center, NSWorkspaceWillSleepNotification, EventType.SUSPEND, "系统挂起"),
+                (workspace_center, NSWorkspaceDidWakeNotification, EventType.RESUME, "系统从挂起恢复"),
+                (workspace_center, NSWorkspaceWillPowerOffNotification, EventType.SHUTDOWN, "系统关闭"),
+                (distributed_center, self.SCREEN_LOCKED, EventType.LOCK, "用户锁定会话"),
+                (distributed_center, self.SCREEN_UNLOCKED, EventType.UNLOCK, "用户解锁会话"),
+            ]
+            for center, name, event_type, description in subscriptions:
+                observer = center.addObserverForName_object_queue_usingBlock_(
+                    name, None, None,
+                    lambda note, et=event_type, desc=description: self._notify_event(et, desc)
+                )
+                self._observers.append((center, observer))
+            
+            self._cf_run_loop = CFRunLoopGetCurrent()
+            run_loop = NSRunLoop.currentRunLoop()
+            while self.is_running and not self._stop_event.is_set():
+                handled = run_loop.runMode_beforeDate_(NSDefaultRunLoopMode, NSDate.distantFuture())
+                if not handled:
+                    # RunLoop 没有输入源时会立即返回，此时退化为等待停止信号
+                    self._stop_event.wait(timeout=1.0)
+        
+        except Exception as e:
+            logger.error(f"macOS事件监听器运行异常: {e}")
+        finally:
+            for center, observer in self._observers:
+                center.removeObserver_(observer)
+            self._observers.clear()
+            self._cf_run_loop = None
+    
+    def stop(self):
+        """停止监听器"""
+        self._stop_event.set()
+        run_loop = self._cf_run_loop
+        if run_loop is not None:
+            from CoreFoundation import CFRunLoopStop
+            CFRunLoopStop(run_loop)
+        super().stop()
+    
+    def _notify_event(self, event_type: EventType, description: str):
+        """通知事件"""
         event_data = SystemEventData(
-            event_type=EventType.STARTUP,
+            event_type=event_type,
             event_time=datetime.now(),
             source=EventSource.SYSTEM,
-            details="macOS应用程序启动",
+            details=description,
             platform_info="macOS"
         )
         self._notify_callbacks(event_data)
-        
-        # 保持监听器运行
-        while self.is_running and not self._stop_event.is_set():
-            time.sleep(1)
 
 
 class LinuxEventListener(EventListener):
-    """Linux事件监听器（占位符）"""
+    """Linux事件监听器（基于 systemd-logind D-Bus 信号）"""
+    
+    LOGIN1_SERVICE = "org.freedesktop.login1"
+    LOGIN1_PATH = "/org/freedesktop/login1"
+    MANAGER_INTERFACE = "org.freedesktop.login1.Manager"
+    SESSION_INTERFACE = "org.freedesktop.login1.Session"
     
     def __init__(self):
         super().__init__("LinuxEventListener")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_future: Optional[asyncio.Future] = None
     
     def get_supported_events(self) -> List[EventType]:
         """获取支持的事件类型"""
@@ -113,25 +183,117 @@ class LinuxEventListener(EventListener):
         ]
     
     def _run(self):
-        """监听器主循环"""
-        logger.info("Linux事件监听器启动（待实现）")
-        
-        # TODO: 实现Linux特定的事件监听
-        # 可以使用D-Bus监听systemd或桌面环境事件
+        """监听器主循环：阻塞在 asyncio 事件循环上，仅在收到 D-Bus 信号时唤醒"""
+        logger.info("Linux事件监听器启动")
         
         # 发送启动事件
+        self._notify_event(EventType.STARTUP, "Linux应用程序启动")
+        
+        try:
+            import dbus_next  # noqa: F401
+        except ImportError:
+            logger.warning("未安装 dbus-next，Linux 锁屏/休眠事件不可用")
+            self._stop_event.wait()
+            return
+        
+        try:
+            asyncio.run(self._run_dbus())
+        except Exception as e:
+            logger.error(f"Linux事件监听器运行异常: {e}")
+        finally:
+            self._loop = None
+            self._stop_future = None
+    
+    async def _run_dbus(self):
+        """订阅 logind 信号并等待停止"""
+        from dbus_next import BusType, Message, MessageType
+        from dbus_next.aio import MessageBus
+        
+        self._loop = asyncio.get_running_loop()
+        self._stop_future = self._loop.create_future()
+        if self._stop_event.is_set():
+            return
+        
+        bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        try:
+            session_path = await self._get_session_path(bus, Message, MessageType)
+            
+            for interface in (self.MANAGER_INTERFACE, self.SESSION_INTERFACE):
+                rule = f"type='signal',sender='{self.LOGIN1_SERVICE}',interface='{interface}'"
+                await bus.call(Message(
+                    destination="org.freedesktop.DBus",
+                    path="/org/freedesktop/DBus",
+                    interface="org.freedesktop.DBus",
+                    member="AddMatch",
+                    signature="s",
+                    body=[rule]
+                ))
+            
+            def handle_message(msg):
+                if msg.message_type != MessageType.SIGNAL:
+                    return
+                
+                if msg.interface == self.MANAGER_INTERFACE:
+                    if msg.member == "PrepareForSleep":
+                        if msg.body[0]:
+                            self._notify_event(EventType.SUSPEND, "系统挂起")
+                        else:
+                            self._notify_event(EventType.RESUME, "系统从挂起恢复")
+                    elif msg.member == "PrepareForShutdown" and msg.body[0]:
+                        self._notify_event(EventType.SHUTDOWN, "系统关闭")
+                
+                elif msg.interface == self.SESSION_INTERFACE:
+                    if session_path is not None and msg.path != session_path:
+                        return
+                    if msg.member == "Lock":
+                        self._notify_event(EventType.LOCK, "用户锁定会话")
+                    elif msg.member == "Unlock":
+                        self._notify_event(EventType.UNLOCK, "用户解锁会话")
+            
+            bus.add_message_handler(handle_message)
+            await self._stop_future
+        finally:
+            bus.disconnect()
+    
+    async def _get_session_path(self, bus, Message, MessageType) -> Optional[str]:
+        """获取当前进程所属的登录会话路径，获取失败时返回 None（接收所有会话信号）"""
+        reply = await bus.call(Message(
+            destination=self.LOGIN1_SERVICE,
+            path=self.LOGIN1_PATH,
+            interface=self.MANAGER_INTERFACE,
+            member="GetSessionByPID",
+            signature="u",
+            body=[os.getpid()]
+        ))
+        if reply.message_type == MessageType.METHOD_RETURN:
+            return reply.body[0]
+        
+        logger.warning("无法获取当前登录会话，将接收所有会话的锁屏信号")
+        return None
+    
+    def stop(self):
+        """停止监听器"""
+        self._stop_event.set()
+        loop, stop_future = self._loop, self._stop_future
+        if loop is not None and stop_future is not None:
+            try:
+                loop.call_soon_threadsafe(
+                    lambda: stop_future.done() or stop_future.set_result(None)
+                )
+            except RuntimeError:
+                pass  # 事件循环已关闭
+        super().stop()
+    
+    def _notify_event(self, event_type: EventType, description: str):
+        """通知事件"""
         event_data = SystemEventData(
-            event_type=EventType.STARTUP,
+            event_type=event_type,
             event_time=datetime.now(),
             source=EventSource.SYSTEM,
-            details="Linux应用程序启动",
+            details=description,
             platform_info="Linux"
         )
         self._notify_callbacks(event_data)
-        
-        # 保持监听器运行
-        while self.is_running and not self._stop_event.is_set():
-            time.sleep(1)
 
 
 class PlatformEventListenerFactory:
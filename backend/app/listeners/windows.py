@@ -2,13 +2,15 @@
 Windows系统事件监听器
 使用Windows API监听系统事件
 """
+import logging
 import platform
-import time
 import ctypes
 import ctypes.wintypes
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+from time import monotonic
 
+from app.config.settings import get_config
 from app.listeners.base import EventListener, SystemEventData
 from app.models import EventType, EventSource
 from app.core.logger import get_logger
@@ -21,6 +23,37 @@ WM_WTSSESSION_CHANGE = 0x02B1
 WM_ENDSESSION = 0x0016
 WM_QUERYENDSESSION = 0x0011
 
+# 消息等待
+INFINITE = 0xFFFFFFFF
+QS_ALLINPUT = 0x04FF
+WAIT_OBJECT_0 = 0x00000000
+WAIT_FAILED = 0xFFFFFFFF
+PM_REMOVE = 0x0001
+
+# 窗口过程回调类型（非 Windows 平台没有 WINFUNCTYPE，仅用于保证模块可导入）
+_WINFUNCTYPE = getattr(ctypes, "WINFUNCTYPE", ctypes.CFUNCTYPE)
+LRESULT = ctypes.wintypes.LPARAM
+WNDPROC = _WINFUNCTYPE(
+    LRESULT, ctypes.wintypes.HWND, ctypes.wintypes.UINT,
+    ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM
+)
+
+
+class WNDCLASS(ctypes.Structure):
+    """WNDCLASSW 结构体（ctypes.wintypes 未提供）"""
+    _fields_ = [
+        ("style", ctypes.wintypes.UINT),
+        ("lpfnWndProc", WNDPROC),
+        ("cbClsExtra", ctypes.c_int),
+        ("cbWndExtra", ctypes.c_int),
+        ("hInstance", ctypes.wintypes.HINSTANCE),
+        ("hIcon", ctypes.wintypes.HICON),
+        ("hCursor", ctypes.wintypes.HANDLE),
+        ("hbrBackground", ctypes.wintypes.HBRUSH),
+        ("lpszMenuName", ctypes.wintypes.LPCWSTR),
+        ("lpszClassName", ctypes.wintypes.LPCWSTR),
+    ]
+
 # 电源事件
 PBT_APMQUERYSUSPEND = 0x0000
 PBT_APMQUERYSTANDBY = 0x0001
@@ -58,6 +91,22 @@ class WindowsEventListener(EventListener):
         self.kernel32 = ctypes.windll.kernel32
         self.wtsapi32 = ctypes.windll.wtsapi32
         
+        self.kernel32.CreateEventW.restype = ctypes.wintypes.HANDLE
+        self.user32.MsgWaitForMultipleObjects.argtypes = [
+            ctypes.wintypes.DWORD, ctypes.POINTER(ctypes.wintypes.HANDLE),
+            ctypes.wintypes.BOOL, ctypes.wintypes.DWORD, ctypes.wintypes.DWORD
+        ]
+        self.user32.MsgWaitForMultipleObjects.restype = ctypes.wintypes.DWORD
+        self.user32.DefWindowProcW.argtypes = [
+            ctypes.wintypes.HWND, ctypes.wintypes.UINT,
+            ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM
+        ]
+        self.user32.DefWindowProcW.restype = LRESULT
+        # 窗口过程回调只包装一次，并由实例持有引用，避免窗口存续期间被回收
+        self._wndproc_cb = WNDPROC(self._window_proc)
+        # 停止信号（手动重置的内核事件），使消息循环可以阻塞等待
+        self._wake_event = self.kernel32.CreateEventW(None, True, False, None)
+        
         # 事件映射
         self.power_event_map = {
             PBT_APMSUSPEND: (EventType.SUSPEND, "系统挂起"),
@@ -73,6 +122,23 @@ class WindowsEventListener(EventListener):
             WTS_SESSION_LOGON: (EventType.STARTUP, "用户登录"),
             WTS_SESSION_LOGOFF: (EventType.SHUTDOWN, "用户注销"),
         }
+        
+        # 源头去重：与上一个已上报事件类型相同且在配置的最小间隔（秒）内的重复事件不再上报
+        members = EventType.__members__
+        self._min_intervals: Dict[EventType, float] = {
+            members[name]: float(interval)
+            for name, interval in get_config("event.min_intervals", {}).items()
+            if name in members
+        }
+        self._last_emit_type: Optional[EventType] = None
+        self._last_emit_time = 0.0
+        
+        # 以 (msg, wparam) 为键的合并查找表，窗口过程每条消息只需一次字典查找
+        self._dispatch = {
+            **{(WM_POWERBROADCAST, code): entry for code, entry in self.power_event_map.items()},
+            **{(WM_WTSSESSION_CHANGE, code): entry for code, entry in self.session_event_map.items()},
+            (WM_ENDSESSION, 1): (EventType.SHUTDOWN, "系统关闭"),  # wparam 为真表示系统正在关闭
+        }
     
     def get_supported_events(self) -> List[EventType]:
         """获取支持的事件类型"""
@@ -91,6 +157,7 @@ class WindowsEventListener(EventListener):
             logger.error("WindowsEventListener只能在Windows系统上运行")
             return
         
+        self.kernel32.ResetEvent(self._wake_event)
         try:
             self._create_window()
             self._register_notifications()
@@ -103,8 +170,8 @@ class WindowsEventListener(EventListener):
     def _create_window(self):
         """创建隐藏窗口用于接收消息"""
         # 定义窗口类
-        wc = ctypes.wintypes.WNDCLASS()
-        wc.lpfnWndProc = self._window_proc
+        wc = WNDCLASS()
+        wc.lpfnWndProc = self._wndproc_cb
         wc.lpszClassName = "TimeTraceEventListener"
         wc.hInstance = self.kernel32.GetModuleHandleW(None)
         
@@ -140,13 +207,11 @@ class WindowsEventListener(EventListener):
     def _window_proc(self, hwnd, msg, wparam, lparam):
         """窗口消息处理函数"""
         try:
-            if msg == WM_POWERBROADCAST:
-                self._handle_power_event(wparam, lparam)
-            elif msg == WM_WTSSESSION_CHANGE:
-                self._handle_session_event(wparam, lparam)
-            elif msg == WM_ENDSESSION:
-                if wparam:  # 系统正在关闭
-                    self._notify_event(EventType.SHUTDOWN, "系统关闭")
+            entry = self._dispatch.get((msg, wparam))
+            if entry is not None:
+                self._notify_event(*entry)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"系统事件: {entry[1]}")
             elif msg == WM_QUERYENDSESSION:
                 self._notify_event(EventType.SHUTDOWN, "系统准备关闭")
                 return True  # 允许关闭
@@ -156,22 +221,17 @@ class WindowsEventListener(EventListener):
         # 调用默认窗口过程
         return self.user32.DefWindowProcW(hwnd, msg, wparam, lparam)
     
-    def _handle_power_event(self, wparam, lparam):
-        """处理电源事件"""
-        if wparam in self.power_event_map:
-            event_type, description = self.power_event_map[wparam]
-            self._notify_event(event_type, description)
-            logger.debug(f"电源事件: {description}")
-    
-    def _handle_session_event(self, wparam, lparam):
-        """处理会话事件"""
-        if wparam in self.session_event_map:
-            event_type, description = self.session_event_map[wparam]
-            self._notify_event(event_type, description)
-            logger.debug(f"会话事件: {description}")
-    
     def _notify_event(self, event_type: EventType, description: str):
         """通知事件"""
+        # 中间夹有其他类型（如 锁屏-解锁-锁屏）时都是真实的状态变化，不能丢弃
+        now = monotonic()
+        if event_type is self._last_emit_type:
+            min_interval = self._min_intervals.get(event_type)
+            if min_interval is not None and now - self._last_emit_time < min_interval:
+                return
+        self._last_emit_type = event_type
+        self._last_emit_time = now
+        
         event_data = SystemEventData(
             event_type=event_type,
             event_time=datetime.now(),
@@ -181,25 +241,35 @@ class WindowsEventListener(EventListener):
         )
         self._notify_callbacks(event_data)
     
+    def stop(self):
+        """停止监听器"""
+        self._stop_event.set()
+        # 唤醒阻塞在 MsgWaitForMultipleObjects 上的消息循环
+        self.kernel32.SetEvent(self._wake_event)
+        super().stop()
+    
     def _message_loop(self):
-        """消息循环"""
+        """消息循环：阻塞等待窗口消息或停止信号"""
         msg = ctypes.wintypes.MSG()
+        handles = (ctypes.wintypes.HANDLE * 1)(self._wake_event)
         
         while self.is_running and not self._stop_event.is_set():
-            # 非阻塞获取消息
-            bRet = self.user32.PeekMessageW(
-                ctypes.byref(msg),
-                self.hwnd,
-                0, 0,
-                1  # PM_REMOVE
+            result = self.user32.MsgWaitForMultipleObjects(
+                1, handles, False, INFINITE, QS_ALLINPUT
             )
             
-            if bRet:
-                self.user32.TranslateMessage(ctypes.byref(msg))
-                self.user32.DispatchMessageW(ctypes.byref(msg))
-            else:
-                # 没有消息时短暂休眠
-                time.sleep(0.1)
+            if result == WAIT_OBJECT_0:
+                # 停止信号
+                break
+            
+            if result == WAIT_OBJECT_0 + 1:
+                # 处理队列中的全部消息后再继续等待
+                while self.user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                    self.user32.TranslateMessage(ctypes.byref(msg))
+                    self.user32.DispatchMessageW(ctypes.byref(msg))
+            elif result == WAIT_FAILED:
+                logger.error(f"等待窗口消息失败: {self.kernel32.GetLastError()}")
+                break
     
     def _cleanup(self):
         """清理资源"""
@@ -2,10 +2,11 @@
 FastAPI主应用程序
 时迹工时追踪系统的API入口
 """
+import logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import time
 import traceback
 from typing import Dict, Any
@@ -17,6 +18,13 @@ from app.schemas.response import ApiResponse, HealthResponse, ErrorResponse
 
 logger = get_logger("API")
 
+# 应用启动时设置一次（进程级全局开关）：本应用及 uvicorn 默认的日志格式都不包含
+# 线程/进程信息，创建日志记录时不再采集这些字段；新增使用 %(thread)d、%(process)d
+# 等字段的日志格式时需要移除这里的设置
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 # 创建FastAPI应用实例
 app = FastAPI(
     title="时迹 - 工时追踪系统",
@@ -24,7 +32,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 
@@ -93,7 +102,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             message=exc.detail,
             error_code=f"HTTP_{exc.status_code}",
             error_details={"path": str(request.url)}
-        ).model_dump()
+        ).model_dump(mode="json")
     )
 
 
@@ -110,7 +119,7 @@ async def general_exception_handler(request: Request, exc: Exception):
             message="服务器内部错误",
             error_code="INTERNAL_ERROR",
             error_details={"error_id": error_id, "path": str(request.url)}
-        ).model_dump()
+        ).model_dump(mode="json")
     )
 
 
@@ -130,17 +139,17 @@ async def health_check():
     """健康检查"""
     try:
         # 检查数据库连接
-        from app.core.database import db_manager
-        db_manager.execute_query("SELECT 1")
+        from app.core.database import get_db_manager
+        get_db_manager().execute_query("SELECT 1")
         
         # 检查事件服务
-        from app.listeners import event_manager
-        service_status = event_manager.get_status()
+        from app.listeners import is_event_manager_running
+        event_service_running = is_event_manager_running()
         
         health_data = HealthResponse(
             status="healthy",
             database="connected",
-            event_service="running" if service_status["is_running"] else "stopped",
+            event_service="running" if event_service_running else "stopped",
             uptime=0.0,  # TODO: 实现运行时间计算
             version="1.0.0"
         )
@@ -280,7 +289,8 @@ async def startup_event():
 
     # 启动事件服务（暂时禁用）
     # try:
-    #     from app.listeners import event_manager, create_platform_listener
+    #     from app.listeners import get_event_manager, create_platform_listener
+    #     event_manager = get_event_manager()
     #
     #     # 创建并注册平台监听器
     #     platform_listener = create_platform_listener()
@@ -302,8 +312,8 @@ async def shutdown_event():
 
     # 停止事件服务（暂时禁用）
     # try:
-    #     from app.listeners import event_manager
-    #     event_manager.stop_all()
+    #     from app.listeners import get_event_manager
+    #     get_event_manager().stop_all()
     #     logger.info("事件服务已停止")
     # except Exception as e:
     #     logger.error(f"停止事件服务失败: {e}")
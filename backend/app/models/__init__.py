@@ -3,27 +3,31 @@
 """
 from .base import (
     RecordStatus, EventType, EventSource, WorkMode, BreakType,
+    RecordStatusLiteral, EventTypeLiteral,
     BaseTimestampModel, BaseResponseModel
 )
 from .time_record import (
     TimeRecordBase, TimeRecordCreate, TimeRecordUpdate, TimeRecord,
-    TimeRecordQuery, DailyStats, WeeklyStats, MonthlyStats, WorkSessionInfo
+    TimeRecordQuery, DailyStats, WeeklyStats, MonthlyStats, WorkSessionInfo,
+    parse_time_record_query
 )
 from .system_event import (
     SystemEventBase, SystemEventCreate, SystemEvent,
-    SystemEventQuery, EventStatistics
+    SystemEventQuery, EventStatistics, parse_system_event_query
 )
 
 __all__ = [
     # 基础枚举和模型
     "RecordStatus", "EventType", "EventSource", "WorkMode", "BreakType",
+    "RecordStatusLiteral", "EventTypeLiteral",
     "BaseTimestampModel", "BaseResponseModel",
 
     # 工时记录模型
     "TimeRecordBase", "TimeRecordCreate", "TimeRecordUpdate", "TimeRecord",
     "TimeRecordQuery", "DailyStats", "WeeklyStats", "MonthlyStats", "WorkSessionInfo",
+    "parse_time_record_query",
 
     # 系统事件模型
     "SystemEventBase", "SystemEventCreate", "SystemEvent",
-    "SystemEventQuery", "EventStatistics"
+    "SystemEventQuery", "EventStatistics", "parse_system_event_query"
 ]
\ No newline at end of file
@@ -3,7 +3,7 @@
 """
 from datetime import datetime, date
 from datetime import time as time_type
-from typing import Optional
+from typing import Any, Optional, Literal
 from enum import Enum
 from pydantic import BaseModel, Field
 
@@ -14,6 +14,14 @@ class RecordStatus(str, Enum):
     ABNORMAL = "abnormal"
     MANUAL = "manual"
     INCOMPLETE = "incomplete"
+    
+    @classmethod
+    def from_raw(cls, value: str) -> "RecordStatus":
+        """由原始字符串解析枚举（直接查表，无效值抛出 ValueError）"""
+        try:
+            return _RECORD_STATUS_MAP[value]
+        except KeyError:
+            raise ValueError(f"无效的记录状态: {value}") from None
 
 
 class EventType(str, Enum):
@@ -24,6 +32,14 @@ class EventType(str, Enum):
     STARTUP = "startup"
     SUSPEND = "suspend"
     RESUME = "resume"
+    
+    @classmethod
+    def from_raw(cls, value: str) -> "EventType":
+        """由原始字符串解析枚举（直接查表，无效值抛出 ValueError）"""
+        try:
+            return _EVENT_TYPE_MAP[value]
+        except KeyError:
+            raise ValueError(f"无效的事件类型: {value}") from None
 
 
 class EventSource(str, Enum):
@@ -31,6 +47,14 @@ class EventSource(str, Enum):
     SYSTEM = "system"
     MANUAL = "manual"
     AUTO = "auto"
+    
+    @classmethod
+    def from_raw(cls, value: str) -> "EventSource":
+        """由原始字符串解析枚举（直接查表，无效值抛出 ValueError）"""
+        try:
+            return _EVENT_SOURCE_MAP[value]
+        except KeyError:
+            raise ValueError(f"无效的事件来源: {value}") from None
 
 
 class WorkMode(str, Enum):
@@ -50,6 +74,22 @@ class BreakType(str, Enum):
     SYSTEM = "system"      # 系统锁屏
 
 
+# 查询模型使用的字面量类型（校验为集合查找，取值与对应枚举一致）
+RecordStatusLiteral = Literal["normal", "abnormal", "manual", "incomplete"]
+EventTypeLiteral = Literal["lock", "unlock", "shutdown", "startup", "suspend", "resume"]
+
+
+def enum_to_value(value: Any) -> Any:
+    """字面量字段的前置校验：枚举成员转换为其字符串值，其他输入原样交给字面量校验"""
+    return value.value if isinstance(value, Enum) else value
+
+
+# 值到枚举成员的查找表，供 from_raw 使用
+_RECORD_STATUS_MAP = {status.value: status for status in RecordStatus}
+_EVENT_TYPE_MAP = {event_type.value: event_type for event_type in EventType}
+_EVENT_SOURCE_MAP = {source.value: source for source in EventSource}
+
+
 class BaseTimestampModel(BaseModel):
     """带时间戳的基础模型"""
     created_at: Optional[datetime] = None
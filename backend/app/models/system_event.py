@@ -2,10 +2,10 @@
 系统事件模型
 """
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
-from .base import EventType, EventSource, BaseTimestampModel
+from .base import EventType, EventTypeLiteral, EventSource, BaseTimestampModel, enum_to_value
 
 
 class SystemEventBase(BaseModel):
@@ -29,12 +29,23 @@ class SystemEvent(SystemEventBase, BaseTimestampModel):
 
 class SystemEventQuery(BaseModel):
     """系统事件查询参数"""
-    event_type: Optional[EventType] = Field(None, description="事件类型")
+    event_type: Optional[EventTypeLiteral] = Field(None, description="事件类型")
     start_time: Optional[datetime] = Field(None, description="开始时间")
     end_time: Optional[datetime] = Field(None, description="结束时间")
     processed: Optional[bool] = Field(None, description="是否已处理")
     page: int = Field(default=1, ge=1, description="页码")
     size: int = Field(default=50, ge=1, le=200, description="每页大小")
+    
+    _event_type_value = field_validator("event_type", mode="before")(enum_to_value)
+
+
+# 查询参数在每次列表请求时解析，复用同一个 TypeAdapter
+_system_event_query_adapter = TypeAdapter(SystemEventQuery)
+
+
+def parse_system_event_query(data: Dict[str, Any]) -> SystemEventQuery:
+    """解析系统事件查询参数"""
+    return _system_event_query_adapter.validate_python(data)
 
 
 class EventStatistics(BaseModel):
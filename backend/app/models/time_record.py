@@ -3,10 +3,10 @@
 """
 from datetime import datetime, date
 from datetime import time as time_type
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Optional, List, Tuple, Dict, Any
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
-from .base import RecordStatus, BaseTimestampModel
+from .base import RecordStatus, RecordStatusLiteral, BaseTimestampModel, enum_to_value
 
 
 class TimeRecordBase(BaseModel):
@@ -20,22 +20,25 @@ class TimeRecordBase(BaseModel):
     status: RecordStatus = RecordStatus.NORMAL
     notes: Optional[str] = None
     
+    @staticmethod
+    def compute(clock_in: datetime, clock_out: datetime, break_minutes: int) -> Tuple[int, int]:
+        """计算工作时长和加班时长（分钟），不修改模型"""
+        # 总时长（分钟）
+        total_minutes = int((clock_out - clock_in).total_seconds()) // 60
+        
+        # 实际工作时长 = 总时长 - 休息时长
+        work_duration = max(0, total_minutes - break_minutes)
+        
+        # 加班时长（超过8小时的部分）
+        standard_minutes = 8 * 60  # 8小时
+        return work_duration, max(0, work_duration - standard_minutes)
+    
     def calculate_duration(self):
         """计算工作时长"""
         if self.clock_in and self.clock_out:
-            # 计算总时长（分钟）
-            total_minutes = int((self.clock_out - self.clock_in).total_seconds() / 60)
-            
-            # 实际工作时长 = 总时长 - 休息时长
-            work_duration = max(0, total_minutes - self.break_duration)
-            self.duration = work_duration
-            
-            # 计算加班时长（超过8小时的部分）
-            standard_minutes = 8 * 60  # 8小时
-            if work_duration > standard_minutes:
-                self.overtime_duration = work_duration - standard_minutes
-            else:
-                self.overtime_duration = 0
+            self.duration, self.overtime_duration = self.compute(
+                self.clock_in, self.clock_out, self.break_duration
+            )
 
 
 class TimeRecordCreate(TimeRecordBase):
@@ -61,11 +64,22 @@ class TimeRecordQuery(BaseModel):
     """工时记录查询参数"""
     start_date: Optional[date] = None
     end_date: Optional[date] = None
-    status: Optional[RecordStatus] = None
+    status: Optional[RecordStatusLiteral] = None
     page: int = 1
     size: int = 20
     order_by: str = "date"
     order_desc: bool = True
+    
+    _status_value = field_validator("status", mode="before")(enum_to_value)
+
+
+# 查询参数在每次列表请求时解析，复用同一个 TypeAdapter
+_time_record_query_adapter = TypeAdapter(TimeRecordQuery)
+
+
+def parse_time_record_query(data: Dict[str, Any]) -> TimeRecordQuery:
+    """解析工时记录查询参数"""
+    return _time_record_query_adapter.validate_python(data)
 
 
 class DailyStats(BaseModel):
@@ -1,19 +1,34 @@
 """
 API响应模式
 """
-from typing import Any, Optional, Generic, TypeVar, List
+import time
+from typing import Any, Optional, Generic, TypeVar, List, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 T = TypeVar('T')
 
+# 最近一次生成的响应时间（秒级时间戳, 对应 datetime）
+_now_cache: Tuple[int, Optional[datetime]] = (0, None)
+
+
+def _now_seconds() -> datetime:
+    """当前时间（精确到秒，同一秒内的响应复用同一个 datetime 对象）"""
+    global _now_cache
+    second = int(time.time())
+    cached_second, cached = _now_cache
+    if second != cached_second or cached is None:
+        cached = datetime.fromtimestamp(second)
+        _now_cache = (second, cached)
+    return cached
+
 
 class ApiResponse(BaseModel, Generic[T]):
     """通用API响应模型"""
     success: bool = Field(..., description="是否成功")
     message: str = Field(..., description="响应消息")
     data: Optional[T] = Field(None, description="响应数据")
-    timestamp: datetime = Field(default_factory=datetime.now, description="响应时间")
+    timestamp: datetime = Field(default_factory=_now_seconds, description="响应时间")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -33,7 +48,7 @@ class ErrorResponse(BaseModel):
     message: str = Field(..., description="错误消息")
     error_code: Optional[str] = Field(None, description="错误代码")
     error_details: Optional[dict] = Field(None, description="错误详情")
-    timestamp: datetime = Field(default_factory=datetime.now, description="响应时间")
+    timestamp: datetime = Field(default_factory=_now_seconds, description="响应时间")
 
 
 class HealthResponse(BaseModel):
@@ -1,7 +1,10 @@
 """
 工具模块包
 """
-from .time_calculator import WorkTimeCalculator, WorkTimeRule, BreakPeriod, work_time_calculator
+from .time_calculator import (
+    WorkTimeCalculator, WorkTimeRule, BreakPeriod, get_work_time_calculator,
+    get_work_time_rule, reload_work_time_rule
+)
 from .date_utils import (
     get_week_range, get_month_range, get_quarter_range, get_year_range,
     get_workdays_in_range, count_workdays_in_month, get_weeks_in_range,
@@ -12,7 +15,8 @@ from .date_utils import (
 
 __all__ = [
     # 工时计算
-    "WorkTimeCalculator", "WorkTimeRule", "BreakPeriod", "work_time_calculator",
+    "WorkTimeCalculator", "WorkTimeRule", "BreakPeriod", "get_work_time_calculator",
+    "get_work_time_rule", "reload_work_time_rule",
 
     # 日期工具
     "get_week_range", "get_month_range", "get_quarter_range", "get_year_range",
@@ -20,4 +24,11 @@ __all__ = [
     "format_duration", "format_time_range", "is_same_day", "get_time_of_day_category",
     "calculate_age_in_days", "get_relative_date_string", "parse_time_string",
     "combine_date_time", "get_business_hours_duration", "get_next_workday", "get_previous_workday"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """兼容 `from app.utils import work_time_calculator` 的旧用法（延迟创建）"""
+    if name == "work_time_calculator":
+        return get_work_time_calculator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
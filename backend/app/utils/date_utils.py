@@ -52,23 +52,21 @@ def get_year_range(year: int) -> Tuple[date, date]:
 
 def get_workdays_in_range(start_date: date, end_date: date) -> List[date]:
     """获取日期范围内的工作日（周一到周五）"""
-    workdays = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        # 0-6 对应周一到周日，0-4是工作日
-        if current_date.weekday() < 5:
-            workdays.append(current_date)
-        current_date += timedelta(days=1)
-    
-    return workdays
+    # 在序数（ordinal）整数空间中遍历，序数 1 为周一，(序数 - 1) % 7 即星期（0-4是工作日）
+    return [
+        date.fromordinal(ordinal)
+        for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1)
+        if (ordinal - 1) % 7 < 5
+    ]
 
 
 def count_workdays_in_month(year: int, month: int) -> int:
     """计算指定月份的工作日数量"""
-    start_date, end_date = get_month_range(year, month)
-    workdays = get_workdays_in_range(start_date, end_date)
-    return len(workdays)
+    first_weekday, last_day = calendar.monthrange(year, month)
+    
+    # 整周各含5个工作日，剩余天数从当月第一天的星期开始逐一判断
+    full_weeks, remainder = divmod(last_day, 7)
+    return full_weeks * 5 + sum(1 for i in range(remainder) if (first_weekday + i) % 7 < 5)
 
 
 def get_weeks_in_range(start_date: date, end_date: date) -> List[Tuple[date, date]]:
@@ -1,11 +1,15 @@
 """
 工时计算工具
 """
+import logging
+import threading
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, date, time, timedelta
 from enum import Enum
 
-from app.models import WorkMode, BreakType, RecordStatus
+from app.models import (
+    WorkMode, BreakType, RecordStatus, TimeRecordCreate, TimeRecordUpdate
+)
 from app.dao import time_record_dao
 from app.config.settings import get_config
 from app.core.logger import get_logger
@@ -13,9 +17,21 @@ from app.core.logger import get_logger
 logger = get_logger("TimeCalculator")
 
 
+def _parse_hhmm(value: str) -> time:
+    """解析 HH:MM 格式的时间字符串"""
+    hour, minute = value.split(":")
+    return time(int(hour), int(minute))
+
+
 class WorkTimeRule:
     """工时计算规则"""
     
+    __slots__ = (
+        "standard_hours", "max_daily_hours", "overtime_threshold", "min_work_duration",
+        "max_break_duration", "auto_break_threshold", "work_start_time", "work_end_time",
+        "lunch_start_time", "lunch_end_time"
+    )
+    
     def __init__(self):
         self.standard_hours = 8.0  # 标准工作时长（小时）
         self.max_daily_hours = 12.0  # 每日最大工作时长
@@ -36,44 +52,66 @@ class WorkTimeRule:
     def _load_config(self):
         """加载配置"""
         try:
-            self.standard_hours = get_config("work.standard_hours", 8.0)
-            self.max_daily_hours = get_config("work.max_daily_hours", 12.0)
-            self.overtime_threshold = get_config("work.overtime_threshold", 8.0)
-            self.min_work_duration = get_config("work.min_work_duration", 0.5)
-            self.max_break_duration = get_config("work.max_break_duration", 2.0)
-            self.auto_break_threshold = get_config("work.auto_break_threshold", 30)
+            # 一次取出整个 work 配置节，避免逐项按路径查找
+            work = get_config("work", {}) or {}
+            self.standard_hours = work.get("standard_hours", 8.0)
+            self.max_daily_hours = work.get("max_daily_hours", 12.0)
+            self.overtime_threshold = work.get("overtime_threshold", 8.0)
+            self.min_work_duration = work.get("min_work_duration", 0.5)
+            self.max_break_duration = work.get("max_break_duration", 2.0)
+            self.auto_break_threshold = work.get("auto_break_threshold", 30)
             
             # 时间配置
-            work_start = get_config("work.start_time", "09:00")
-            work_end = get_config("work.end_time", "18:00")
-            lunch_start = get_config("work.lunch_start", "12:00")
-            lunch_end = get_config("work.lunch_end", "13:00")
-            
-            self.work_start_time = datetime.strptime(work_start, "%H:%M").time()
-            self.work_end_time = datetime.strptime(work_end, "%H:%M").time()
-            self.lunch_start_time = datetime.strptime(lunch_start, "%H:%M").time()
-            self.lunch_end_time = datetime.strptime(lunch_end, "%H:%M").time()
+            self.work_start_time = _parse_hhmm(work.get("start_time", "09:00"))
+            self.work_end_time = _parse_hhmm(work.get("end_time", "18:00"))
+            self.lunch_start_time = _parse_hhmm(work.get("lunch_start", "12:00"))
+            self.lunch_end_time = _parse_hhmm(work.get("lunch_end", "13:00"))
             
         except Exception as e:
             logger.warning(f"加载工时规则配置失败，使用默认值: {e}")
 
 
+# 全局共享的工时规则（首次使用时创建，所有计算器共用一份配置）
+_work_time_rule: Optional[WorkTimeRule] = None
+_work_time_rule_lock = threading.Lock()
+
+
+def get_work_time_rule() -> WorkTimeRule:
+    """获取共享的工时规则实例"""
+    global _work_time_rule
+    if _work_time_rule is None:
+        with _work_time_rule_lock:
+            if _work_time_rule is None:
+                _work_time_rule = WorkTimeRule()
+    return _work_time_rule
+
+
+def reload_work_time_rule():
+    """配置变更后重新加载共享的工时规则（原地更新，已持有该实例的计算器同步生效）"""
+    if _work_time_rule is not None:
+        _work_time_rule._load_config()
+
+
 class BreakPeriod:
     """休息时段"""
     
+    __slots__ = ("start_time", "end_time", "break_type", "description", "_duration_minutes")
+    
     def __init__(self, start_time: datetime, end_time: datetime = None, 
                  break_type: BreakType = BreakType.SHORT, description: str = ""):
         self.start_time = start_time
-        self.end_time = end_time
+        self.end_time = None
         self.break_type = break_type
         self.description = description
+        # 休息结束时计算一次并缓存，进行中的休息为 0
+        self._duration_minutes = 0
+        if end_time:
+            self.end_break(end_time)
     
     @property
     def duration_minutes(self) -> int:
         """休息时长（分钟）"""
-        if not self.end_time:
-            return 0
-        return int((self.end_time - self.start_time).total_seconds() / 60)
+        return self._duration_minutes
     
     @property
     def is_active(self) -> bool:
@@ -83,14 +121,21 @@ class BreakPeriod:
     def end_break(self, end_time: datetime):
         """结束休息"""
         self.end_time = end_time
+        self._duration_minutes = int((end_time - self.start_time).total_seconds() / 60)
 
 
 class WorkTimeCalculator:
     """工时计算器"""
     
+    __slots__ = (
+        "work_mode", "rules", "session_start", "session_end", "last_activity",
+        "break_periods", "current_break", "_closed_break_minutes",
+        "total_work_duration", "total_break_duration", "overtime_duration"
+    )
+    
     def __init__(self, work_mode: WorkMode = WorkMode.STANDARD):
         self.work_mode = work_mode
-        self.rules = WorkTimeRule()
+        self.rules = get_work_time_rule()
         
         # 当前会话状态
         self.session_start: Optional[datetime] = None
@@ -100,6 +145,8 @@ class WorkTimeCalculator:
         # 休息时段记录
         self.break_periods: List[BreakPeriod] = []
         self.current_break: Optional[BreakPeriod] = None
+        # 已结束休息的累计时长（分钟），在结束休息时累加，避免每次查询状态时重新求和
+        self._closed_break_minutes = 0
         
         # 统计数据
         self.total_work_duration = 0  # 总工作时长（分钟）
@@ -118,6 +165,7 @@ class WorkTimeCalculator:
         # 重置统计
         self.break_periods.clear()
         self.current_break = None
+        self._closed_break_minutes = 0
         self.total_work_duration = 0
         self.total_break_duration = 0
         self.overtime_duration = 0
@@ -155,7 +203,8 @@ class WorkTimeCalculator:
         self.current_break = BreakPeriod(start_time, None, break_type, description)
         self.break_periods.append(self.current_break)
         
-        logger.debug(f"开始休息: {start_time}, 类型: {break_type}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"开始休息: {start_time}, 类型: {break_type}")
     
     def end_break(self, end_time: datetime):
         """结束休息"""
@@ -164,9 +213,11 @@ class WorkTimeCalculator:
             return
         
         self.current_break.end_break(end_time)
+        self._closed_break_minutes += self.current_break.duration_minutes
         self.last_activity = end_time
         
-        logger.debug(f"结束休息: {end_time}, 时长: {self.current_break.duration_minutes}分钟")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"结束休息: {end_time}, 时长: {self.current_break.duration_minutes}分钟")
         self.current_break = None
     
     def _calculate_work_time(self) -> Dict[str, Any]:
@@ -177,8 +228,13 @@ class WorkTimeCalculator:
         # 总会话时长
         total_session_minutes = (self.session_end - self.session_start).total_seconds() / 60
         
-        # 计算总休息时长
-        total_break_minutes = sum(bp.duration_minutes for bp in self.break_periods)
+        # 计算总休息时长和分类休息时长（单次遍历）
+        break_by_type = {break_type.value: 0 for break_type in BreakType}
+        total_break_minutes = 0
+        for bp in self.break_periods:
+            minutes = bp.duration_minutes
+            break_by_type[bp.break_type.value] += minutes
+            total_break_minutes += minutes
         
         # 实际工作时长
         actual_work_minutes = max(0, total_session_minutes - total_break_minutes)
@@ -190,14 +246,6 @@ class WorkTimeCalculator:
         standard_minutes = self.rules.standard_hours * 60
         overtime_minutes = max(0, work_minutes - standard_minutes)
         
-        # 分类休息时长
-        break_by_type = {}
-        for break_type in BreakType:
-            break_by_type[break_type.value] = sum(
-                bp.duration_minutes for bp in self.break_periods 
-                if bp.break_type == break_type
-            )
-        
         return {
             "session_start": self.session_start,
             "session_end": self.session_end,
@@ -250,8 +298,6 @@ class WorkTimeCalculator:
     def _save_to_database(self, calculation_result: Dict[str, Any]):
         """保存计算结果到数据库"""
         try:
-            from app.models import TimeRecordCreate
-            
             work_date = self.session_start.date()
             
             # 检查是否已有记录
@@ -262,10 +308,10 @@ class WorkTimeCalculator:
             if calculation_result['break_periods']:
                 notes += f", 休息次数: {len(calculation_result['break_periods'])}"
             
+            # 以下字段均由本模块计算得到，类型已确定，跳过 pydantic 校验直接构造模型
             if existing_record:
                 # 更新现有记录
-                from app.models import TimeRecordUpdate
-                update_data = TimeRecordUpdate(
+                update_data = TimeRecordUpdate.model_construct(
                     clock_out=self.session_end,
                     break_duration=calculation_result['total_break_minutes'],
                     notes=notes
@@ -274,7 +320,7 @@ class WorkTimeCalculator:
                 logger.info(f"更新工时记录: {work_date}")
             else:
                 # 创建新记录
-                record_data = TimeRecordCreate(
+                record_data = TimeRecordCreate.model_construct(
                     date=work_date,
                     clock_in=self.session_start,
                     clock_out=self.session_end,
@@ -296,14 +342,19 @@ class WorkTimeCalculator:
             return {"active": False}
         
         now = datetime.now()
+        # 当前休息只取一次，后续判断和输出都使用局部变量
+        current_break = self.current_break
+        on_break = current_break is not None and current_break.end_time is None
         
-        # 计算当前工作时长
+        # 计算当前工作时长（与已结束的休息及入库结果一样按墙上时间计算，挂起期间同样计入会话时长）
         current_session_minutes = (now - self.session_start).total_seconds() / 60
-        current_break_minutes = sum(bp.duration_minutes for bp in self.break_periods)
+        current_break_minutes = self._closed_break_minutes
         
         # 如果正在休息，加上当前休息时长
-        if self.current_break and self.current_break.is_active:
-            current_break_minutes += (now - self.current_break.start_time).total_seconds() / 60
+        active_break_minutes = 0.0
+        if on_break:
+            active_break_minutes = (now - current_break.start_time).total_seconds() / 60
+            current_break_minutes += active_break_minutes
         
         current_work_minutes = max(0, current_session_minutes - current_break_minutes)
         
@@ -316,16 +367,34 @@ class WorkTimeCalculator:
             "work_duration_minutes": int(current_work_minutes),
             "break_duration_minutes": int(current_break_minutes),
             "work_hours": current_work_minutes / 60,
-            "is_on_break": self.current_break is not None and self.current_break.is_active,
+            "is_on_break": on_break,
             "current_break": {
-                "start_time": self.current_break.start_time,
-                "type": self.current_break.break_type.value,
-                "duration_minutes": int((now - self.current_break.start_time).total_seconds() / 60)
-            } if self.current_break and self.current_break.is_active else None,
+                "start_time": current_break.start_time,
+                "type": current_break.break_type.value,
+                "duration_minutes": int(active_break_minutes)
+            } if on_break else None,
             "work_mode": self.work_mode.value,
             "break_count": len(self.break_periods)
         }
 
 
-# 全局工时计算器实例
-work_time_calculator = WorkTimeCalculator()
+# 全局工时计算器实例（首次使用时创建，避免导入时读取配置）
+_work_time_calculator: Optional[WorkTimeCalculator] = None
+_work_time_calculator_lock = threading.Lock()
+
+
+def get_work_time_calculator() -> WorkTimeCalculator:
+    """获取工时计算器实例"""
+    global _work_time_calculator
+    if _work_time_calculator is None:
+        with _work_time_calculator_lock:
+            if _work_time_calculator is None:
+                _work_time_calculator = WorkTimeCalculator()
+    return _work_time_calculator
+
+
+def __getattr__(name: str) -> Any:
+    """兼容 `from app.utils.time_calculator import work_time_calculator` 的旧用法（延迟创建）"""
+    if name == "work_time_calculator":
+        return get_work_time_calculator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
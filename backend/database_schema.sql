@@ -113,12 +113,12 @@ CREATE TABLE IF NOT EXISTS schema_versions (
 
 -- 创建索引
 -- 工时记录表索引
-CREATE INDEX IF NOT EXISTS idx_time_records_date ON time_records(date);
-CREATE INDEX IF NOT EXISTS idx_time_records_status ON time_records(status);
+-- date 列已有 UNIQUE 约束索引；(status, date) 复合索引同时覆盖按状态筛选
+CREATE INDEX IF NOT EXISTS idx_time_records_status_date ON time_records(status, date DESC);
 CREATE INDEX IF NOT EXISTS idx_time_records_created_at ON time_records(created_at);
 
 -- 系统事件表索引
-CREATE INDEX IF NOT EXISTS idx_system_events_type ON system_events(event_type);
+CREATE INDEX IF NOT EXISTS idx_system_events_type_time ON system_events(event_type, event_time DESC);
 CREATE INDEX IF NOT EXISTS idx_system_events_time ON system_events(event_time);
 CREATE INDEX IF NOT EXISTS idx_system_events_processed ON system_events(processed);
 
@@ -4,20 +4,20 @@
 import os
 import sys
 from pathlib import Path
+from typing import List, Tuple
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.core.database import db_manager
+from app.core.database import get_db_manager
 from app.core.logger import get_logger
 
 logger = get_logger("DatabaseInit")
 
 
-def create_tables():
-    """创建数据库表"""
-    
+def _schema_statements() -> List[str]:
+    """建表和索引语句（每个元素为一条语句）"""
     # 工时记录表
     time_records_sql = """
     CREATE TABLE IF NOT EXISTS time_records (
@@ -78,43 +78,38 @@ def create_tables():
     """
     
     # 创建索引
+    # date 列的 UNIQUE 约束自带索引，按状态筛选并按日期排序的查询走 (status, date) 复合索引；
+    # 事件类型的单列索引被 (event_type, event_time) 复合索引的前缀覆盖，旧库中一并删除
     indexes_sql = [
-        "CREATE INDEX IF NOT EXISTS idx_time_records_date ON time_records(date);",
-        "CREATE INDEX IF NOT EXISTS idx_system_events_type ON system_events(event_type);",
+        "DROP INDEX IF EXISTS idx_time_records_date;",
+        "DROP INDEX IF EXISTS idx_system_events_type;",
+        "CREATE INDEX IF NOT EXISTS idx_time_records_status_date ON time_records(status, date DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_system_events_type_time ON system_events(event_type, event_time DESC);",
         "CREATE INDEX IF NOT EXISTS idx_system_events_time ON system_events(event_time);",
         "CREATE INDEX IF NOT EXISTS idx_system_events_processed ON system_events(processed);",
         "CREATE INDEX IF NOT EXISTS idx_operation_logs_operation ON operation_logs(operation);",
-        "CREATE INDEX IF NOT EXISTS idx_operation_logs_timestamp ON operation_logs(timestamp);"
+        "CREATE INDEX IF NOT EXISTS idx_operation_logs_timestamp ON operation_logs(timestamp);",
+        "CREATE INDEX IF NOT EXISTS idx_operation_logs_target ON operation_logs(target_type, target_id);"
     ]
     
-    try:
-        # 创建表
-        db_manager.execute_script(time_records_sql)
-        logger.info("工时记录表创建成功")
-        
-        db_manager.execute_script(system_events_sql)
-        logger.info("系统事件表创建成功")
-        
-        db_manager.execute_script(system_config_sql)
-        logger.info("系统配置表创建成功")
-        
-        db_manager.execute_script(operation_logs_sql)
-        logger.info("操作日志表创建成功")
-        
-        # 创建索引
-        for index_sql in indexes_sql:
-            db_manager.execute_script(index_sql)
-        
-        logger.info("数据库索引创建成功")
-        
-    except Exception as e:
-        logger.error(f"创建数据库表失败: {e}")
-        raise
+    return [
+        time_records_sql,
+        system_events_sql,
+        system_config_sql,
+        operation_logs_sql,
+        *indexes_sql
+    ]
 
 
-def insert_default_config():
-    """插入默认配置"""
-    
+# 默认配置由主键冲突忽略已存在的项
+INSERT_CONFIG_SQL = """
+    INSERT OR IGNORE INTO system_config (key, value, description, data_type, category)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _default_config_operations() -> List[Tuple[str, Tuple]]:
+    """默认配置的插入操作列表"""
     default_configs = [
         ("work.standard_hours", "8.0", "标准工作时长（小时）", "float", "work"),
         ("work.max_daily_hours", "12.0", "每日最大工作时长（小时）", "float", "work"),
@@ -132,32 +127,12 @@ def insert_default_config():
         ("database.backup_enabled", "true", "是否启用数据库备份", "boolean", "database"),
         ("database.backup_interval", "24", "数据库备份间隔（小时）", "integer", "database")
     ]
-    
-    try:
-        for key, value, description, data_type, category in default_configs:
-            # 检查配置是否已存在
-            existing = db_manager.execute_query(
-                "SELECT key FROM system_config WHERE key = ?", (key,)
-            )
-            
-            if not existing:
-                db_manager.execute_insert(
-                    """
-                    INSERT INTO system_config (key, value, description, data_type, category)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (key, value, description, data_type, category)
-                )
-        
-        logger.info("默认配置插入成功")
-        
-    except Exception as e:
-        logger.error(f"插入默认配置失败: {e}")
-        raise
+    return [(INSERT_CONFIG_SQL, config) for config in default_configs]
 
 
 def verify_database():
     """验证数据库结构"""
+    db_manager = get_db_manager()
     
     required_tables = [
         "time_records",
@@ -176,9 +151,7 @@ def verify_database():
         logger.info("数据库结构验证成功")
         
         # 验证配置表
-        config_count = db_manager.execute_query(
-            "SELECT COUNT(*) as count FROM system_config"
-        )[0]['count']
+        config_count = db_manager.execute_scalar("SELECT COUNT(*) FROM system_config")
         
         logger.info(f"系统配置表包含 {config_count} 条记录")
         
@@ -193,14 +166,15 @@ def init_database():
         logger.info("开始初始化数据库...")
         
         # 检查数据库连接
-        if not db_manager.check_connection():
+        if not get_db_manager().check_connection():
             raise Exception("数据库连接失败")
         
-        # 创建表
-        create_tables()
-        
-        # 插入默认配置
-        insert_default_config()
+        # 建表、建索引和插入默认配置在同一个事务中完成，首次启动只提交一次
+        get_db_manager().execute_transaction(
+            [(statement, ()) for statement in _schema_statements()]
+            + _default_config_operations()
+        )
+        logger.info("数据库表、索引和默认配置创建成功")
         
         # 验证数据库
         verify_database()
@@ -0,0 +1,30 @@
+"""
+测试配置
+测试代码只在此目录内被 pytest 收集，生产代码不导入 tests 包
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到Python路径（收集测试前完成，测试模块无需各自处理）
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    """使用临时数据库文件的数据库管理器（替换全局实例，测试结束后关闭）"""
+    from app.core import database
+    from scripts.init_db import _schema_statements
+    
+    db_path = str(tmp_path / "time_trace.db")
+    monkeypatch.setattr(database.DatabaseManager, "_get_db_path", lambda self: db_path)
+    manager = database.DatabaseManager()
+    manager.execute_transaction([(statement, ()) for statement in _schema_statements()])
+    monkeypatch.setattr(database, "_db_manager", manager)
+    
+    yield manager
+    
+    manager.close()
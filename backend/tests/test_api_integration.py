@@ -66,10 +66,11 @@ def test_api_routes():
         from app.main import app
         
         # 获取路由信息
-        routes = []
-        for route in app.routes:
-            if hasattr(route, 'path'):
-                routes.append(f"{route.methods} {route.path}")
+        app_routes = app.routes
+        routes = [
+            f"{getattr(route, 'methods', None)} {route.path}"
+            for route in app_routes if getattr(route, 'path', None)
+        ]
         
         print("✓ API路由:")
         for route in routes:
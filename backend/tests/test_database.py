@@ -0,0 +1,121 @@
+"""
+数据库事务与批量插入测试
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.database import _is_closed_error
+from app.dao.system_event import SystemEventDAO
+from app.models import EventType, SystemEventCreate
+
+INSERT_CONFIG_SQL = "INSERT INTO system_config (key, value) VALUES (?, ?)"
+
+
+def _count(db_manager, table: str) -> int:
+    """表中的记录数"""
+    return db_manager.execute_scalar(f"SELECT COUNT(*) FROM {table}")
+
+
+def test_execute_transaction_empty(db_manager):
+    """空操作列表不影响任何行"""
+    assert db_manager.execute_transaction([]) == 0
+
+
+def test_execute_transaction_commits_all_operations(db_manager):
+    """连续的相同语句合并执行，全部提交"""
+    operations = [(INSERT_CONFIG_SQL, (f"test.key{i}", str(i))) for i in range(3)]
+    operations.append(("UPDATE system_config SET value = ? WHERE key = ?", ("x", "test.key0")))
+
+    assert db_manager.execute_transaction(operations) == 4
+    assert _count(db_manager, "system_config") == 3
+    assert db_manager.execute_scalar(
+        "SELECT value FROM system_config WHERE key = ?", ("test.key0",)
+    ) == "x"
+
+
+def test_execute_transaction_rolls_back_on_error(db_manager):
+    """任一语句失败时整个事务回滚"""
+    operations = [
+        (INSERT_CONFIG_SQL, ("test.key", "1")),
+        (INSERT_CONFIG_SQL, ("test.key", "2")),  # 主键冲突
+    ]
+
+    with pytest.raises(Exception):
+        db_manager.execute_transaction(operations)
+
+    assert _count(db_manager, "system_config") == 0
+
+
+@pytest.mark.parametrize("total, chunk_statements, row_statements", [
+    (0, 0, 0),
+    (499, 0, 499),
+    (500, 1, 0),
+    (501, 1, 1),
+])
+def test_create_many_chunk_boundaries(db_manager, monkeypatch, total, chunk_statements, row_statements):
+    """满 500 行的整块使用多行 VALUES 语句，剩余行使用单行语句"""
+    dao = SystemEventDAO()
+    captured = []
+    execute_transaction = db_manager.execute_transaction
+
+    def capture(operations):
+        captured.extend(operations)
+        return execute_transaction(operations)
+
+    monkeypatch.setattr(db_manager, "execute_transaction", capture)
+
+    start = datetime(2024, 1, 1, 9, 0)
+    events = [
+        SystemEventCreate(event_type=EventType.LOCK, event_time=start + timedelta(seconds=i))
+        for i in range(total)
+    ]
+
+    assert dao.create_many(events) == total
+    assert sum(1 for sql, _ in captured if sql == dao._insert_chunk_sql) == chunk_statements
+    assert sum(1 for sql, _ in captured if sql == dao._insert_row_sql) == row_statements
+    assert _count(db_manager, "system_events") == total
+
+    if total:
+        times = [
+            row["event_time"]
+            for row in db_manager.execute_query("SELECT event_time FROM system_events ORDER BY id")
+        ]
+        assert times == [event.event_time.isoformat() for event in events]
+
+
+def test_cleanup_closes_idle_connections_in_place(db_manager):
+    """清理过期连接时连接留在池中，使用中的连接不被关闭"""
+    pool = db_manager.pool
+    pool_size = len(pool.pool)
+
+    with pool.get_connection() as conn:
+        conn.execute("SELECT 1")
+        for pooled in list(pool.pool) + list(pool._in_use):
+            pooled.connect()
+            pooled.last_used -= 3600
+
+        pool._cleanup_expired_connections()
+
+        assert len(pool.pool) == pool_size - 1
+        assert all(pooled.connection is None for pooled in pool.pool)
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+
+    assert len(pool.pool) == pool_size
+
+
+def test_is_closed_error_matches_only_closed_database():
+    """只有连接已关闭的错误被识别为连接失效"""
+    conn = sqlite3.connect(":memory:")
+    conn.close()
+    with pytest.raises(sqlite3.ProgrammingError) as closed:
+        conn.execute("SELECT 1")
+    assert _is_closed_error(closed.value)
+
+    conn = sqlite3.connect(":memory:")
+    with pytest.raises(sqlite3.ProgrammingError) as misuse:
+        conn.execute("SELECT ?", (1, 2))
+    conn.close()
+    assert not _is_closed_error(misuse.value)
+
@@ -0,0 +1,35 @@
+"""
+日期工具测试
+"""
+import calendar
+from datetime import date
+
+from app.utils.date_utils import count_workdays_in_month, get_workdays_in_range
+
+
+def test_count_workdays_in_month_known_values():
+    """已知月份的工作日数量"""
+    assert count_workdays_in_month(2021, 2) == 20  # 周一开始的28天
+    assert count_workdays_in_month(2024, 2) == 21  # 闰年二月
+    assert count_workdays_in_month(2024, 6) == 20  # 周六开始的30天
+    assert count_workdays_in_month(2023, 12) == 21  # 周五开始的31天
+
+
+def test_count_workdays_in_month_matches_day_by_day_count():
+    """与逐日统计的结果一致"""
+    for year in range(1990, 2041):
+        for month in range(1, 13):
+            _, last_day = calendar.monthrange(year, month)
+            expected = sum(
+                1 for day in range(1, last_day + 1) if date(year, month, day).weekday() < 5
+            )
+            assert count_workdays_in_month(year, month) == expected, (year, month)
+
+
+def test_get_workdays_in_range():
+    """日期范围内的工作日（包含首尾）"""
+    assert get_workdays_in_range(date(2024, 1, 5), date(2024, 1, 9)) == [
+        date(2024, 1, 5), date(2024, 1, 8), date(2024, 1, 9)
+    ]
+    assert get_workdays_in_range(date(2024, 1, 6), date(2024, 1, 7)) == []
+    assert get_workdays_in_range(date(2024, 1, 9), date(2024, 1, 8)) == []
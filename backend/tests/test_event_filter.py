@@ -0,0 +1,65 @@
+"""
+事件过滤设置热更新测试
+"""
+import copy
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.listeners import base
+from app.listeners.base import EventFilter
+from app.main import app
+from app.models import EventType
+
+
+class _StubManager:
+    """只带过滤器的事件管理器替身（不启动处理线程）"""
+
+    def __init__(self):
+        self.event_filter = EventFilter()
+
+
+@pytest.fixture
+def isolated_settings(tmp_path, monkeypatch):
+    """配置写入临时文件，测试结束后恢复内存中的配置"""
+    monkeypatch.setattr(settings, "config_file", tmp_path / "config.json")
+    monkeypatch.setattr(settings, "config_data", copy.deepcopy(settings.config_data))
+
+
+@pytest.fixture
+def running_manager(monkeypatch):
+    """替换全局事件管理器"""
+    manager = _StubManager()
+    monkeypatch.setattr(base, "_event_manager", manager)
+    return manager
+
+
+def test_event_settings_update_reaches_running_filter(isolated_settings, running_manager):
+    """通过配置接口更新事件设置后，运行中的过滤器立即生效"""
+    client = TestClient(app, base_url="http://localhost")
+    response = client.put("/api/v1/config/event/settings", json={
+        "enabled_types": ["LOCK", "UNLOCK"],
+        "min_intervals": {"LOCK": 30}
+    })
+
+    assert response.status_code == 200
+    event_filter = running_manager.event_filter
+    assert event_filter.enabled_types == frozenset({EventType.LOCK, EventType.UNLOCK})
+    assert event_filter.min_intervals == {EventType.LOCK: 30.0}
+    assert event_filter.get_settings() == {
+        "enabled_types": ["lock", "unlock"],
+        "min_intervals": {"lock": 30.0}
+    }
+
+
+def test_single_event_key_update_reaches_running_filter(isolated_settings, running_manager):
+    """更新单个 event.* 配置项后重新加载过滤设置"""
+    client = TestClient(app, base_url="http://localhost")
+    response = client.put(
+        "/api/v1/config/key/event.enabled_types",
+        json={"value": ["SUSPEND"]}
+    )
+
+    assert response.status_code == 200
+    assert running_manager.event_filter.enabled_types == frozenset({EventType.SUSPEND})
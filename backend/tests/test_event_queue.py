@@ -0,0 +1,102 @@
+"""
+事件队列淘汰策略与退出顺序测试
+"""
+import threading
+
+from app.listeners import base
+from app.listeners.base import EventListener, EventQueue, SystemEventData
+from app.models import EventType
+
+
+def _queued_types(event_queue: EventQueue):
+    """队列中事件类型（按入队顺序）"""
+    return [event.event_type for event in event_queue._dq]
+
+
+def test_full_queue_evicts_oldest_consecutive_duplicate():
+    """队列已满时优先淘汰最早的连续重复事件，状态变化（含挂起/恢复）保留"""
+    event_queue = EventQueue(max_size=4)
+    for event_type in (EventType.SUSPEND, EventType.RESUME, EventType.LOCK, EventType.LOCK):
+        event_queue.put(SystemEventData(event_type))
+
+    event_queue.put(SystemEventData(EventType.UNLOCK))
+
+    assert _queued_types(event_queue) == [
+        EventType.SUSPEND, EventType.RESUME, EventType.LOCK, EventType.UNLOCK
+    ]
+    assert event_queue.dropped_count() == 1
+
+
+def test_full_queue_without_duplicates_evicts_oldest():
+    """队列中没有连续重复事件时淘汰最早的事件"""
+    event_queue = EventQueue(max_size=2)
+    event_queue.put(SystemEventData(EventType.LOCK))
+    event_queue.put(SystemEventData(EventType.UNLOCK))
+
+    event_queue.put(SystemEventData(EventType.SUSPEND))
+
+    assert _queued_types(event_queue) == [EventType.UNLOCK, EventType.SUSPEND]
+    assert event_queue.dropped_count() == 1
+
+
+def test_queue_below_capacity_drops_nothing():
+    """队列未满时不淘汰事件"""
+    event_queue = EventQueue(max_size=3)
+    event_queue.put(SystemEventData(EventType.SUSPEND))
+    event_queue.put(SystemEventData(EventType.RESUME))
+
+    assert event_queue.size() == 2
+    assert event_queue.dropped_count() == 0
+
+
+def test_concurrent_producers_keep_state_changes():
+    """多个线程同时入队时容量不超限，只淘汰重复事件，丢弃数准确"""
+    event_queue = EventQueue(max_size=50)
+    producers = 8
+    per_producer = 200
+    barrier = threading.Barrier(producers)
+
+    def produce(index: int):
+        barrier.wait()
+        event_queue.put(SystemEventData(EventType.LOCK if index == 0 else EventType.SUSPEND))
+        for _ in range(per_producer - 1):
+            event_queue.put(SystemEventData(EventType.SUSPEND))
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert event_queue.size() == 50
+    assert EventType.LOCK in _queued_types(event_queue)
+    assert event_queue.dropped_count() == producers * per_producer - 50
+
+
+class _ShutdownReportingListener(EventListener):
+    """停止时上报 SHUTDOWN 事件的监听器"""
+
+    def __init__(self, event_queue: EventQueue):
+        super().__init__("shutdown-reporter")
+        self.add_callback(event_queue.put)
+
+    def _run(self):
+        self._stop_event.wait()
+        self._notify_callbacks(SystemEventData(EventType.SHUTDOWN))
+
+    def get_supported_events(self):
+        return [EventType.SHUTDOWN]
+
+
+def test_shutdown_stops_listeners_before_draining_queue():
+    """退出钩子先停止监听器，停止过程中上报的事件仍会被处理"""
+    processed = []
+    event_queue = EventQueue()
+    event_queue.start_processing(processed.extend)
+    listener = _ShutdownReportingListener(event_queue)
+    listener.start()
+
+    base._shutdown()
+
+    assert not listener.is_running
+    assert [event.event_type for event in processed] == [EventType.SHUTDOWN]
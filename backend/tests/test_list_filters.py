@@ -0,0 +1,49 @@
+"""
+列表查询筛选参数测试
+"""
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+
+from app.dao import system_event_dao, time_record_dao
+from app.main import app
+from app.models import (
+    EventType, RecordStatus, SystemEventCreate, TimeRecordCreate,
+    parse_system_event_query, parse_time_record_query
+)
+
+
+def test_query_models_accept_enum_members():
+    """查询模型接受枚举成员，转换为字符串值"""
+    assert parse_time_record_query({"status": RecordStatus.MANUAL}).status == "manual"
+    assert parse_system_event_query({"event_type": EventType.LOCK}).event_type == "lock"
+
+
+def test_list_time_records_filters_by_status(db_manager):
+    """按状态筛选工时记录列表"""
+    time_record_dao.create(TimeRecordCreate(date=date(2024, 1, 1), status=RecordStatus.NORMAL))
+    time_record_dao.create(TimeRecordCreate(date=date(2024, 1, 2), status=RecordStatus.MANUAL))
+
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get("/api/v1/time-records/", params={"status": "manual"})
+
+    assert response.status_code == 200
+    items = response.json()["data"]["items"]
+    assert [item["date"] for item in items] == ["2024-01-02"]
+    assert items[0]["status"] == "manual"
+
+
+def test_list_system_events_filters_by_event_type(db_manager):
+    """按事件类型筛选系统事件列表"""
+    system_event_dao.create_many([
+        SystemEventCreate(event_type=event_type, event_time=datetime(2024, 1, 1, 9, minute))
+        for minute, event_type in ((0, EventType.LOCK), (1, EventType.UNLOCK), (2, EventType.LOCK))
+    ])
+
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get("/api/v1/system-events/", params={"event_type": "lock"})
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 2
+    assert {item["event_type"] for item in data["items"]} == {"lock"}
@@ -0,0 +1,232 @@
+"""
+Linux / macOS 系统通知到事件类型的映射测试（D-Bus 与通知中心均为替身）
+"""
+import sys
+import threading
+import types
+from enum import Enum
+
+import pytest
+
+from app.listeners.platform import LinuxEventListener, MacOSEventListener
+from app.models import EventType
+
+
+class _Recorder:
+    """收集监听器上报的事件"""
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event_data):
+        self.events.append((event_data.event_type, event_data.details))
+
+    def types(self):
+        return [event_type for event_type, _ in self.events]
+
+
+# ---- Linux：dbus_next 替身 ----
+
+class _MessageType(Enum):
+    METHOD_CALL = 1
+    METHOD_RETURN = 2
+    SIGNAL = 4
+
+
+class _BusType(Enum):
+    SYSTEM = 1
+
+
+class _Message:
+    def __init__(self, message_type=_MessageType.METHOD_CALL, interface=None, member=None,
+                 path=None, body=None, **kwargs):
+        self.message_type = message_type
+        self.interface = interface
+        self.member = member
+        self.path = path
+        self.body = body or []
+
+
+class _MessageBus:
+    """记录消息处理器，GetSessionByPID 返回固定会话路径"""
+
+    instance = None
+    ready = threading.Event()
+    session_path = "/org/freedesktop/login1/session/_31"
+
+    def __init__(self, bus_type=None):
+        self.handlers = []
+        _MessageBus.instance = self
+
+    async def connect(self):
+        return self
+
+    async def call(self, message):
+        if message.member == "GetSessionByPID":
+            return _Message(_MessageType.METHOD_RETURN, body=[self.session_path])
+        return _Message(_MessageType.METHOD_RETURN)
+
+    def add_message_handler(self, handler):
+        self.handlers.append(handler)
+        self.ready.set()
+
+    def disconnect(self):
+        pass
+
+    def emit(self, interface, member, body=None, path=None):
+        for handler in self.handlers:
+            handler(_Message(_MessageType.SIGNAL, interface=interface, member=member,
+                             path=path, body=body))
+
+
+@pytest.fixture
+def fake_dbus(monkeypatch):
+    """注入 dbus_next 替身模块"""
+    dbus_next = types.ModuleType("dbus_next")
+    dbus_next.BusType = _BusType
+    dbus_next.Message = _Message
+    dbus_next.MessageType = _MessageType
+    aio = types.ModuleType("dbus_next.aio")
+    aio.MessageBus = _MessageBus
+    dbus_next.aio = aio
+    monkeypatch.setitem(sys.modules, "dbus_next", dbus_next)
+    monkeypatch.setitem(sys.modules, "dbus_next.aio", aio)
+    _MessageBus.instance = None
+    _MessageBus.ready = threading.Event()
+    return _MessageBus
+
+
+def _wait_for_bus(fake_dbus):
+    """等待监听器线程完成订阅"""
+    assert fake_dbus.ready.wait(timeout=5), "监听器未订阅 D-Bus 信号"
+    return fake_dbus.instance
+
+
+def test_linux_logind_signals_map_to_event_types(fake_dbus):
+    """logind 信号映射为对应的事件类型"""
+    listener = LinuxEventListener()
+    recorder = _Recorder()
+    listener.add_callback(recorder)
+    listener.start()
+    try:
+        bus = _wait_for_bus(fake_dbus)
+        manager, session = LinuxEventListener.MANAGER_INTERFACE, LinuxEventListener.SESSION_INTERFACE
+        bus.emit(manager, "PrepareForSleep", [True])
+        bus.emit(manager, "PrepareForSleep", [False])
+        bus.emit(session, "Lock", path=fake_dbus.session_path)
+        bus.emit(session, "Unlock", path=fake_dbus.session_path)
+        bus.emit(manager, "PrepareForShutdown", [True])
+    finally:
+        listener.stop()
+
+    assert recorder.types() == [
+        EventType.STARTUP, EventType.SUSPEND, EventType.RESUME,
+        EventType.LOCK, EventType.UNLOCK, EventType.SHUTDOWN
+    ]
+
+
+def test_linux_ignores_other_sessions_and_unrelated_signals(fake_dbus):
+    """其他会话的锁屏信号、取消关机及无关信号不上报"""
+    listener = LinuxEventListener()
+    recorder = _Recorder()
+    listener.add_callback(recorder)
+    listener.start()
+    try:
+        bus = _wait_for_bus(fake_dbus)
+        manager, session = LinuxEventListener.MANAGER_INTERFACE, LinuxEventListener.SESSION_INTERFACE
+        bus.emit(session, "Lock", path="/org/freedesktop/login1/session/other")
+        bus.emit(manager, "PrepareForShutdown", [False])
+        bus.emit(manager, "SessionNew", ["2", "/org/freedesktop/login1/session/_32"])
+    finally:
+        listener.stop()
+
+    assert recorder.types() == [EventType.STARTUP]
+
+
+# ---- macOS：AppKit / Foundation / CoreFoundation 替身 ----
+
+class _NotificationCenter:
+    """按通知名记录观察者回调"""
+
+    def __init__(self):
+        self.blocks = {}
+
+    def addObserverForName_object_queue_usingBlock_(self, name, obj, queue, block):
+        self.blocks[name] = block
+        return name
+
+    def removeObserver_(self, observer):
+        self.blocks.pop(observer, None)
+
+    def post(self, name):
+        self.blocks[name](None)
+
+
+class _RunLoop:
+    """RunLoop 替身：标记就绪后短暂休眠"""
+
+    def __init__(self, ready: threading.Event):
+        self.ready = ready
+
+    def runMode_beforeDate_(self, mode, date):
+        self.ready.set()
+        threading.Event().wait(0.01)
+        return True
+
+
+@pytest.fixture
+def fake_appkit(monkeypatch):
+    """注入 PyObjC 替身模块，返回 (工作区通知中心, 分布式通知中心, 就绪事件)"""
+    workspace_center = _NotificationCenter()
+    distributed_center = _NotificationCenter()
+    ready = threading.Event()
+
+    appkit = types.ModuleType("AppKit")
+    appkit.NSWorkspace = types.SimpleNamespace(
+        sharedWorkspace=lambda: types.SimpleNamespace(notificationCenter=lambda: workspace_center)
+    )
+    appkit.NSWorkspaceWillSleepNotification = "NSWorkspaceWillSleepNotification"
+    appkit.NSWorkspaceDidWakeNotification = "NSWorkspaceDidWakeNotification"
+    appkit.NSWorkspaceWillPowerOffNotification = "NSWorkspaceWillPowerOffNotification"
+
+    foundation = types.ModuleType("Foundation")
+    foundation.NSDistributedNotificationCenter = types.SimpleNamespace(
+        defaultCenter=lambda: distributed_center
+    )
+    foundation.NSRunLoop = types.SimpleNamespace(currentRunLoop=lambda: _RunLoop(ready))
+    foundation.NSDate = types.SimpleNamespace(distantFuture=lambda: None)
+    foundation.NSDefaultRunLoopMode = "kCFRunLoopDefaultMode"
+
+    core_foundation = types.ModuleType("CoreFoundation")
+    core_foundation.CFRunLoopGetCurrent = lambda: object()
+    core_foundation.CFRunLoopStop = lambda run_loop: None
+
+    monkeypatch.setitem(sys.modules, "AppKit", appkit)
+    monkeypatch.setitem(sys.modules, "Foundation", foundation)
+    monkeypatch.setitem(sys.modules, "CoreFoundation", core_foundation)
+    return workspace_center, distributed_center, ready
+
+
+def test_macos_notifications_map_to_event_types(fake_appkit):
+    """NSWorkspace 与屏幕锁定通知映射为对应的事件类型"""
+    workspace_center, distributed_center, ready = fake_appkit
+    listener = MacOSEventListener()
+    recorder = _Recorder()
+    listener.add_callback(recorder)
+    listener.start()
+    try:
+        assert ready.wait(timeout=5)
+        workspace_center.post("NSWorkspaceWillSleepNotification")
+        workspace_center.post("NSWorkspaceDidWakeNotification")
+        distributed_center.post(MacOSEventListener.SCREEN_LOCKED)
+        distributed_center.post(MacOSEventListener.SCREEN_UNLOCKED)
+        workspace_center.post("NSWorkspaceWillPowerOffNotification")
+    finally:
+        listener.stop()
+
+    assert recorder.types() == [
+        EventType.STARTUP, EventType.SUSPEND, EventType.RESUME,
+        EventType.LOCK, EventType.UNLOCK, EventType.SHUTDOWN
+    ]
+    # 停止后移除所有观察者
+    assert workspace_center.blocks == {} and distributed_center.blocks == {}
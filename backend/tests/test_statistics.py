@@ -0,0 +1,59 @@
+"""
+统计分析API测试
+"""
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+
+from app.dao import time_record_dao
+from app.main import app
+from app.models import RecordStatus, TimeRecordCreate
+
+
+def _create_record(day: int, status: RecordStatus = RecordStatus.NORMAL):
+    """创建 2024-01 指定日期的 9:00-18:00 工时记录"""
+    time_record_dao.create(TimeRecordCreate(
+        date=date(2024, 1, day),
+        clock_in=datetime(2024, 1, day, 9, 0),
+        clock_out=datetime(2024, 1, day, 18, 0),
+        break_duration=60,
+        status=status
+    ))
+
+
+def test_daily_statistics_with_record(db_manager):
+    """有记录的日期返回记录的状态和时长"""
+    _create_record(3, RecordStatus.MANUAL)
+
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get("/api/v1/statistics/daily/2024-01-03")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["date"] == "2024-01-03"
+    assert data["status"] == "manual"
+    assert data["work_hours"] == 8.0
+    assert data["clock_in_time"] == "09:00:00"
+
+
+def test_weekly_statistics_with_record(db_manager):
+    """周统计中有记录的日期带上状态，其余日期为空"""
+    _create_record(3)
+
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get("/api/v1/statistics/weekly/2024-01-03")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["week_start"] == "2024-01-01"
+    assert data["work_days"] == 1
+    statuses = [day["status"] for day in data["daily_records"]]
+    assert statuses == [None, None, "normal", None, None, None, None]
+
+
+def test_daily_statistics_rejects_invalid_date(db_manager):
+    """日期格式错误时返回400"""
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get("/api/v1/statistics/daily/2024-13-40")
+
+    assert response.status_code == 400
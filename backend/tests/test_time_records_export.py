@@ -0,0 +1,87 @@
+"""
+工时记录CSV导出测试
+"""
+import csv
+import io
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+
+from app.api.v1.time_records import EXPORT_COLUMNS, _iter_csv
+from app.dao import time_record_dao
+from app.main import app
+from app.models import RecordStatus, TimeRecordCreate
+
+
+def _parse_csv(content: bytes):
+    """解析导出内容（去掉BOM）"""
+    text = content.decode("utf-8")
+    assert text.startswith("\ufeff")
+    return list(csv.reader(io.StringIO(text[1:])))
+
+
+def test_iter_csv_flushes_in_batches():
+    """按批次输出，拼接后与完整内容一致"""
+    rows = [dict.fromkeys(EXPORT_COLUMNS, i) for i in range(5)]
+
+    chunks = list(_iter_csv(iter(rows), flush_rows=2))
+
+    assert len(chunks) == 3
+    parsed = _parse_csv(b"".join(chunks))
+    assert parsed[0] == list(EXPORT_COLUMNS)
+    assert [row[0] for row in parsed[1:]] == ["0", "1", "2", "3", "4"]
+
+
+def test_export_csv_streams_filtered_records(db_manager):
+    """按日期范围导出记录，按日期升序"""
+    for day, status in ((3, RecordStatus.NORMAL), (1, RecordStatus.MANUAL), (2, RecordStatus.NORMAL)):
+        time_record_dao.create(TimeRecordCreate(
+            date=date(2024, 1, day),
+            clock_in=datetime(2024, 1, day, 9, 0),
+            clock_out=datetime(2024, 1, day, 18, 0),
+            break_duration=60,
+            status=status,
+            notes="备注,含逗号"
+        ))
+    time_record_dao.create(TimeRecordCreate(date=date(2024, 2, 1)))
+
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get(
+        "/api/v1/time-records/export/csv",
+        params={"start_date": "2024-01-01", "end_date": "2024-01-31"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+
+    parsed = _parse_csv(response.content)
+    assert parsed[0] == list(EXPORT_COLUMNS)
+    records = [dict(zip(EXPORT_COLUMNS, row)) for row in parsed[1:]]
+    assert [record["date"] for record in records] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert records[0]["status"] == "manual"
+    assert records[0]["duration"] == "480"
+    assert records[0]["notes"] == "备注,含逗号"
+
+
+def test_export_csv_rejects_invalid_status(db_manager):
+    """状态参数无效时返回400"""
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get("/api/v1/time-records/export/csv", params={"status": "unknown"})
+
+    assert response.status_code == 400
+
+
+def test_export_csv_filters_by_status(db_manager):
+    """按状态筛选导出记录"""
+    for day, status in ((1, RecordStatus.NORMAL), (2, RecordStatus.MANUAL), (3, RecordStatus.MANUAL)):
+        time_record_dao.create(TimeRecordCreate(date=date(2024, 1, day), status=status))
+
+    client = TestClient(app, base_url="http://localhost")
+    response = client.get("/api/v1/time-records/export/csv", params={"status": "manual"})
+
+    assert response.status_code == 200
+    parsed = _parse_csv(response.content)
+    records = [dict(zip(EXPORT_COLUMNS, row)) for row in parsed[1:]]
+    assert [record["date"] for record in records] == ["2024-01-02", "2024-01-03"]
+    assert {record["status"] for record in records} == {"manual"}
@@ -6,43 +6,46 @@ import os
 import sys
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-def run_command(command, cwd=None, check=True):
-    """运行命令并处理错误"""
-    print(f"执行命令: {command}")
+def run_command(command, cwd=None, check=True, label=None):
+    """运行命令并处理错误（逐行输出命令日志，不在内存中缓存全部输出）
+
+    label 不为空时每行输出都带上 [label] 前缀，并行执行的命令输出交错时可以区分来源。
+    """
+    prefix = f"[{label}] " if label else ""
+    print(f"{prefix}执行命令: {command}")
     if cwd:
-        print(f"工作目录: {cwd}")
+        print(f"{prefix}工作目录: {cwd}")
     
     try:
-        result = subprocess.run(
+        with subprocess.Popen(
             command,
             shell=True,
             cwd=cwd,
-            check=check,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            encoding='utf-8'
-        )
-        if result.stdout:
-            print(result.stdout)
-        return result
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1
+        ) as process:
+            for line in process.stdout:
+                # 前缀与内容一次写出，避免并行输出时同一行被拆开
+                print(prefix + line, end='')
+        
+        if check and process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command)
+        return subprocess.CompletedProcess(command, process.returncode)
     except subprocess.CalledProcessError as e:
-        print(f"命令执行失败: {e}")
-        if e.stdout:
-            print(f"标准输出: {e.stdout}")
-        if e.stderr:
-            print(f"错误输出: {e.stderr}")
+        print(f"{prefix}命令执行失败: {e}")
         sys.exit(1)
 
 
-def build_frontend():
-    """构建前端应用"""
-    print("=" * 50)
-    print("开始构建前端应用...")
-    print("=" * 50)
-    
+def install_frontend_deps():
+    """安装前端依赖"""
     frontend_dir = Path(__file__).parent.parent / "frontend"
     
     # 检查前端目录是否存在
@@ -50,9 +53,17 @@ def build_frontend():
         print("错误: 前端目录不存在")
         sys.exit(1)
     
-    # 安装依赖
     print("安装前端依赖...")
-    run_command("npm install", cwd=frontend_dir)
+    run_command("npm install", cwd=frontend_dir, label="npm")
+
+
+def build_frontend():
+    """构建前端应用"""
+    print("=" * 50)
+    print("开始构建前端应用...")
+    print("=" * 50)
+    
+    frontend_dir = Path(__file__).parent.parent / "frontend"
     
     # 构建前端
     print("构建前端应用...")
@@ -76,11 +87,19 @@ def prepare_backend():
     
     # 安装后端依赖
     print("安装后端依赖...")
-    run_command("pip install -r requirements.txt", cwd=backend_dir)
+    run_command("pip install -r requirements.txt", cwd=backend_dir, label="pip")
     
     print("后端环境准备完成!")
 
 
+def install_dependencies():
+    """并行安装前端和后端依赖（两者互不依赖，主要耗时在网络和解包）"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(install_frontend_deps), executor.submit(prepare_backend)]
+        for future in futures:
+            future.result()
+
+
 def copy_frontend_to_backend():
     """将前端构建结果复制到后端"""
     print("=" * 50)
@@ -100,14 +119,18 @@ def copy_frontend_to_backend():
     if backend_static.exists():
         shutil.rmtree(backend_static)
     
-    # 复制前端构建结果
-    shutil.copytree(frontend_dist, backend_static)
+    # 复制前端构建结果（静态资源无需保留文件元数据，使用 copyfile 跳过权限和时间戳的复制）
+    shutil.copytree(frontend_dist, backend_static, copy_function=shutil.copyfile)
     
     print("前端资源复制完成!")
 
 
-def package_application():
-    """打包应用程序"""
+# 打包时排除的未使用标准库模块，减少依赖分析时间和产物体积
+EXCLUDED_MODULES = ("tkinter", "unittest", "test", "pydoc_data")
+
+
+def package_application(release=False):
+    """打包应用程序（发布构建为单文件，开发构建为目录形式以加快打包和启动）"""
     print("=" * 50)
     print("打包应用程序...")
     print("=" * 50)
@@ -129,14 +152,19 @@ def package_application():
         app_name = "TimeTrace"
         icon_option = ""
     
+    # 开发构建使用目录形式并跳过UPX压缩，发布构建才生成单文件
+    bundle_option = "--onefile" if release else "--onedir --noupx"
+    exclude_options = " ".join(f"--exclude-module {name}" for name in EXCLUDED_MODULES)
+    
     # PyInstaller命令
     pyinstaller_cmd = f"""
     pyinstaller
-    --onefile
+    {bundle_option}
     --noconsole
     --name TimeTrace
     {icon_option}
     --add-data "static;static"
+    {exclude_options}
     --distpath ../dist
     --workpath ../build
     --specpath ../build
@@ -146,7 +174,8 @@ def package_application():
     # 执行打包
     run_command(pyinstaller_cmd, cwd=backend_dir)
     
-    print(f"应用程序打包完成: {dist_dir / app_name}")
+    app_path = dist_dir / app_name if release else dist_dir / "TimeTrace" / app_name
+    print(f"应用程序打包完成: {app_path}")
 
 
 def clean_build_files():
@@ -166,10 +195,14 @@ def clean_build_files():
         project_root / "frontend" / "node_modules" / ".cache"
     ]
     
-    for dir_path in clean_dirs:
-        if dir_path.exists():
-            print(f"删除目录: {dir_path}")
-            shutil.rmtree(dir_path)
+    existing_dirs = [dir_path for dir_path in clean_dirs if dir_path.exists()]
+    for dir_path in existing_dirs:
+        print(f"删除目录: {dir_path}")
+    
+    # 各目录互不相关，并行删除（耗时主要在文件系统调用上）
+    if existing_dirs:
+        with ThreadPoolExecutor(max_workers=len(existing_dirs)) as executor:
+            list(executor.map(shutil.rmtree, existing_dirs))
     
     print("构建文件清理完成!")
 
@@ -192,10 +225,10 @@ def main():
     
     try:
         # 构建步骤
+        install_dependencies()
         build_frontend()
-        prepare_backend()
         copy_frontend_to_backend()
-        package_application()
+        package_application(release="--release" in sys.argv)
         
         print("=" * 50)
         print("构建完成!")